@@ -21,6 +21,20 @@ from datetime import datetime
 import urllib.parse
 from pathlib import Path
 
+try:
+    import orjson  # 可选：更快的 JSON 解析，直接处理 bytes
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+try:
+    # 可选：流式构造 multipart 请求体，大文件上传时无需整体缓存到内存
+    from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
+except ImportError:
+    MultipartEncoder = None
+    MultipartEncoderMonitor = None
+
 # 确保可以导入 shared 模块
 REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
@@ -28,6 +42,44 @@ if str(REPO_ROOT) not in sys.path:
 
 from shared.forum_config import load_forum_settings
 
+# 回复结果判定标记：直接在 response.content 字节上匹配，避免整页解码和 lower() 拷贝
+_FASTPOST_OK_MARKERS = ('回复发布成功'.encode('utf-8'), b'succeed', b'Succeed', b'SUCCEED')
+_REPLY_OK_MARKERS = ('发布成功'.encode('utf-8'), b'succeed', b'Succeed', b'SUCCEED')
+
+# 腾讯云上传按钮识别规则
+_RE_TENCENT_TEXT = re.compile(r'腾讯云|上传|云存储', re.I)
+_RE_TENCENT_ATTR = re.compile(r'tencent|cloud|upload', re.I)
+
+# 帖子列表/详情页解析规则（每页每行都会用到，模块加载时编译一次）
+_RE_THREAD_LINK = re.compile(r'thread-\d+-\d+-\d+\.html')
+_RE_THREAD_ID = re.compile(r'thread-(\d+)-')
+_RE_SPACE_UID_LINK = re.compile(r'space-uid-\d+\.html')
+_RE_SPACE_UID = re.compile(r'space-(uid-\d+)\.html')
+_RE_VIDEO_LINK = re.compile(r'https?://[^"\']*\.(?:mp4|avi|mov|mkv|flv|wmv|webm)', re.IGNORECASE)
+
+# 基础内容清理规则，按顺序依次替换：(规则, 替换文本)
+_BASIC_CLEANUP_RULES = (
+    # 🎯 移除论坛表单字段（TTS任务）："制作AI声音"标题、"选择音色:"及其值
+    (re.compile(r'制作AI声音\s*', re.IGNORECASE), ''),
+    (re.compile(r'选择音色\s*[:：]\s*[^\n]*'), ''),
+    # 移除"音色克隆"相关字段
+    (re.compile(r'音色克隆\s*'), ''),
+    (re.compile(r'音色名称\s*[:：]\s*[^\n]*'), ''),
+    # 移除其他常见表单字段
+    (re.compile(r'语速\s*[:：]\s*[^\n]*'), ''),
+    (re.compile(r'情感\s*[:：]\s*[^\n]*'), ''),
+    # 移除系统标识
+    (re.compile(r'懒人智能剪辑\s*'), ''),
+    # 移除封面信息
+    (re.compile(r'封面标题[上中下]?\s*[:：]\s*[^\n]*'), ''),
+    # 移除链接
+    (re.compile(r'https?://[^\s]+'), ''),
+    (re.compile(r'\[url[^\]]*\].*?\[/url\]', re.IGNORECASE), ''),
+    # 清理多余的空白字符：移除多余空行、合并空格
+    (re.compile(r'\n\s*\n'), '\n'),
+    (re.compile(r'\s+'), ' '),
+)
+
 
 class AicutForumCrawler:
     """懒人同城号AI论坛爬虫 - 专门监控智能剪口播板块"""
@@ -77,6 +129,7 @@ class AicutForumCrawler:
         self.logged_in = False
         self.last_check_time = 0
         self.processed_threads = set()  # 已处理的帖子ID
+        self._last_seen_max_id = 0  # 已处理帖子中的最大ID（帖子列表游标）
         self.first_check_completed = False  # 标记是否完成首次检查
 
         # 初始化已处理帖子列表
@@ -105,6 +158,7 @@ class AicutForumCrawler:
                 with open(self.processed_posts_file, 'r', encoding='utf-8') as f:
                     processed_list = json.load(f)
                     self.processed_threads = set(processed_list)
+                    self._last_seen_max_id = self._max_thread_id(self.processed_threads)
                     print(f"💾 生产模式：加载了 {len(self.processed_threads)} 个已处理帖子记录")
             else:
                 self.processed_threads = set()
@@ -129,13 +183,30 @@ class AicutForumCrawler:
         except Exception as e:
             print(f"❌ 保存已处理帖子记录失败: {e}")
 
+    @staticmethod
+    def _max_thread_id(thread_ids) -> int:
+        """返回帖子ID集合中的最大数值ID（忽略非数字ID）"""
+        return max((int(tid) for tid in thread_ids if str(tid).isdigit()), default=0)
+
     def mark_post_processed(self, post_id: str):
         """标记帖子为已处理并立即保存（生产模式）"""
         self.processed_threads.add(post_id)
+        self._last_seen_max_id = max(self._last_seen_max_id, self._max_thread_id((post_id,)))
 
         if not self.test_mode:
             # 生产模式：立即保存到文件
             self._save_processed_posts()
+
+    def mark_posts_processed(self, post_ids: List[str]):
+        """批量标记帖子为已处理，生产模式下只写一次文件"""
+        if not post_ids:
+            return
+
+        self.processed_threads.update(post_ids)
+        self._last_seen_max_id = max(self._last_seen_max_id, self._max_thread_id(post_ids))
+
+        if not self.test_mode:
+            self._save_processed_posts()
     
     def login(self) -> bool:
         """登录论坛（幂等）：已登录或存在有效cookie时直接返回True，避免重复登录"""
@@ -247,8 +318,13 @@ class AicutForumCrawler:
             traceback.print_exc()
             return False
     
-    def get_forum_threads(self) -> List[Dict[str, Any]]:
-        """获取智能剪口播板块的所有帖子"""
+    def get_forum_threads(self, since_thread_id: int = 0) -> List[Dict[str, Any]]:
+        """获取智能剪口播板块的帖子
+
+        Args:
+            since_thread_id: 帖子ID游标，大于0时跳过ID不大于该值的帖子（Discuz 帖子ID自增，
+                这些帖子已经见过），不再解析其作者、时间等信息
+        """
         try:
             print(f"📋 获取板块帖子: {self.forum_url}")
 
@@ -299,21 +375,22 @@ class AicutForumCrawler:
 
             # 方法3: 查找包含thread链接的元素
             if not thread_rows:
-                thread_links = soup.find_all('a', href=re.compile(r'thread-\d+-\d+-\d+\.html'))
+                thread_links = soup.find_all('a', href=_RE_THREAD_LINK)
                 print(f"🔍 直接查找：找到 {len(thread_links)} 个thread链接")
                 # 将链接转换为行格式
                 thread_rows = [link.parent for link in thread_links if link.parent]
 
             processed_thread_ids = set()  # 避免重复处理
+            skipped_by_cursor = 0  # 因游标跳过的旧帖子数
 
             for i, row in enumerate(thread_rows):
                 try:
                     # 查找帖子链接 - 优先查找带标题的链接（class="xst"）
-                    thread_link = row.find('a', class_='xst', href=re.compile(r'thread-\d+-\d+-\d+\.html'))
+                    thread_link = row.find('a', class_='xst', href=_RE_THREAD_LINK)
 
                     # 如果没找到，查找所有thread链接，选择有文本的
                     if not thread_link:
-                        all_thread_links = row.find_all('a', href=re.compile(r'thread-\d+-\d+-\d+\.html'))
+                        all_thread_links = row.find_all('a', href=_RE_THREAD_LINK)
                         for link in all_thread_links:
                             if link.get_text(strip=True):
                                 thread_link = link
@@ -321,7 +398,7 @@ class AicutForumCrawler:
 
                     # 如果还是没找到，使用第一个thread链接
                     if not thread_link:
-                        thread_link = row.find('a', href=re.compile(r'thread-\d+-\d+-\d+\.html'))
+                        thread_link = row.find('a', href=_RE_THREAD_LINK)
 
                     if not thread_link:
                         continue
@@ -332,7 +409,7 @@ class AicutForumCrawler:
                         thread_url = self.base_url + '/' + thread_url.lstrip('/')
 
                     # 提取帖子ID
-                    thread_id_match = re.search(r'thread-(\d+)-', thread_url)
+                    thread_id_match = _RE_THREAD_ID.search(thread_url)
                     if not thread_id_match:
                         continue
 
@@ -343,12 +420,17 @@ class AicutForumCrawler:
                         continue
                     processed_thread_ids.add(thread_id)
 
+                    # 游标之前的旧帖子：直接跳过（列表按回复时间排序，不能提前结束遍历）
+                    if since_thread_id and int(thread_id) <= since_thread_id:
+                        skipped_by_cursor += 1
+                        continue
+
                     # 获取帖子标题
                     title = thread_link.get_text(strip=True)
 
                     # 如果标题为空，尝试从其他thread链接获取
                     if not title:
-                        all_thread_links = row.find_all('a', href=re.compile(r'thread-\d+-\d+-\d+\.html'))
+                        all_thread_links = row.find_all('a', href=_RE_THREAD_LINK)
                         for link in all_thread_links:
                             link_text = link.get_text(strip=True)
                             if link_text:
@@ -360,7 +442,7 @@ class AicutForumCrawler:
                     author_id = ""
 
                     # 在帖子行中查找所有 space-uid 链接
-                    space_uid_links = row.find_all('a', href=re.compile(r'space-uid-\d+\.html'))
+                    space_uid_links = row.find_all('a', href=_RE_SPACE_UID_LINK)
 
                     if space_uid_links:
                         # 通常第一个 space-uid 链接是发帖作者，最后一个是最后回复者
@@ -381,7 +463,7 @@ class AicutForumCrawler:
                         if author_link:
                             author = author_link.get_text(strip=True)
                             author_href = author_link.get('href', '')
-                            author_id_match = re.search(r'space-(uid-\d+)\.html', author_href)
+                            author_id_match = _RE_SPACE_UID.search(author_href)
                             if author_id_match:
                                 author_id = author_id_match.group(1)  # 结果：uid-5
 
@@ -413,9 +495,11 @@ class AicutForumCrawler:
                     continue
 
             print(f"📊 共发现 {len(threads)} 个帖子")
+            if skipped_by_cursor:
+                print(f"⏭️ 跳过 {skipped_by_cursor} 个旧帖子 (ID <= {since_thread_id})")
 
             # 如果没有找到帖子，输出调试信息
-            if not threads:
+            if not threads and not skipped_by_cursor:
                 print("🔍 未找到帖子，输出页面调试信息...")
                 print(f"页面标题: {soup.title.get_text() if soup.title else '无标题'}")
                 # 查找可能的错误信息
@@ -533,7 +617,7 @@ class AicutForumCrawler:
                         authi = first_post.find(class_='authi')
                         if authi:
                             # 在 .authi 区域内查找作者链接
-                            author_link = authi.find('a', href=re.compile(r'space-uid-\d+\.html'))
+                            author_link = authi.find('a', href=_RE_SPACE_UID_LINK)
                             if author_link:
                                 print("✅ 在帖子作者信息区域找到作者链接")
 
@@ -547,7 +631,7 @@ class AicutForumCrawler:
                         if title_container:
                             # 在标题容器的兄弟元素中查找作者链接
                             for sibling in title_container.find_next_siblings():
-                                author_link = sibling.find('a', href=re.compile(r'space-uid-\d+\.html'))
+                                author_link = sibling.find('a', href=_RE_SPACE_UID_LINK)
                                 if author_link:
                                     print("✅ 在帖子标题附近找到作者链接")
                                     break
@@ -565,7 +649,7 @@ class AicutForumCrawler:
                     for selector in post_info_selectors:
                         post_info = soup.select_one(selector)
                         if post_info:
-                            author_link = post_info.find('a', href=re.compile(r'space-uid-\d+\.html'))
+                            author_link = post_info.find('a', href=_RE_SPACE_UID_LINK)
                             if author_link:
                                 print(f"✅ 在 {selector} 区域找到作者链接")
                                 break
@@ -573,7 +657,7 @@ class AicutForumCrawler:
                 # 方法4: 最后兜底 - 但要排除导航栏和回复者链接
                 if not author_link:
                     # 查找所有 space-uid 链接，但排除明显的导航区域
-                    all_space_links = soup.find_all('a', href=re.compile(r'space-uid-\d+\.html'))
+                    all_space_links = soup.find_all('a', href=_RE_SPACE_UID_LINK)
 
                     for link in all_space_links:
                         # 检查链接是否在导航栏或页脚
@@ -608,7 +692,7 @@ class AicutForumCrawler:
                     author = author_link.get_text(strip=True) or author
                     author_href = author_link.get('href', '')
                     # 从 space-uid-5.html 中提取 uid-5
-                    author_id_match = re.search(r'space-(uid-\d+)\.html', author_href)
+                    author_id_match = _RE_SPACE_UID.search(author_href)
                     if author_id_match:
                         author_id = author_id_match.group(1)  # 结果：uid-5
                         print(f"👤 精确提取作者信息: {author} (ID: {author_id})")
@@ -663,7 +747,7 @@ class AicutForumCrawler:
         soup = BeautifulSoup(html_content, 'html.parser')
 
         # 查找所有包含视频链接的 <a> 标签
-        video_links = soup.find_all('a', href=re.compile(r'https?://[^"\']*\.(?:mp4|avi|mov|mkv|flv|wmv|webm)', re.IGNORECASE))
+        video_links = soup.find_all('a', href=_RE_VIDEO_LINK)
 
         for link in video_links:
             url = link.get('href')
@@ -989,39 +1073,11 @@ class AicutForumCrawler:
 
     def _basic_content_processing(self, content: str) -> Dict[str, Any]:
         """基础内容处理（备用方案）"""
-        import re
-
         # 基础清理
         core_text = content
-
-        # 🎯 移除论坛表单字段（TTS任务）
-        # 移除"制作AI声音"标题
-        core_text = re.sub(r'制作AI声音\s*', '', core_text, flags=re.IGNORECASE)
-
-        # 移除"选择音色:"及其值（支持多种格式）
-        core_text = re.sub(r'选择音色\s*[:：]\s*[^\n]*', '', core_text)
-
-        # 移除"音色克隆"相关字段
-        core_text = re.sub(r'音色克隆\s*', '', core_text)
-        core_text = re.sub(r'音色名称\s*[:：]\s*[^\n]*', '', core_text)
-
-        # 移除其他常见表单字段
-        core_text = re.sub(r'语速\s*[:：]\s*[^\n]*', '', core_text)
-        core_text = re.sub(r'情感\s*[:：]\s*[^\n]*', '', core_text)
-
-        # 移除系统标识
-        core_text = re.sub(r'懒人智能剪辑\s*', '', core_text)
-
-        # 移除封面信息
-        core_text = re.sub(r'封面标题[上中下]?\s*[:：]\s*[^\n]*', '', core_text)
-
-        # 移除链接
-        core_text = re.sub(r'https?://[^\s]+', '', core_text)
-        core_text = re.sub(r'\[url[^\]]*\].*?\[/url\]', '', core_text, flags=re.IGNORECASE)
-
-        # 清理多余的空白字符
-        core_text = re.sub(r'\n\s*\n', '\n', core_text)  # 移除多余空行
-        core_text = re.sub(r'\s+', ' ', core_text).strip()  # 合并空格
+        for pattern, replacement in _BASIC_CLEANUP_RULES:
+            core_text = pattern.sub(replacement, core_text)
+        core_text = core_text.strip()
 
         return {
             'core_text': core_text,
@@ -1077,8 +1133,11 @@ class AicutForumCrawler:
         try:
             print(f"🔍 开始监控智能剪口播板块 ({datetime.now().strftime('%H:%M:%S')})")
 
-            # 获取所有帖子
-            threads = self.get_forum_threads()
+            # 获取帖子列表：生产模式完成首次检查后，按游标只解析比已处理帖子更新的帖子
+            if not self.test_mode and self.first_check_completed:
+                threads = self.get_forum_threads(since_thread_id=self._last_seen_max_id)
+            else:
+                threads = self.get_forum_threads()
 
             new_video_posts = []
 
@@ -1136,9 +1195,8 @@ class AicutForumCrawler:
                     # 首次启动：标记现有帖子为已处理，不实际处理
                     print("🔄 生产模式首次启动，标记现有帖子为已处理...")
                     for thread in threads:
-                        thread_id = thread['thread_id']
-                        self.mark_post_processed(thread_id)
-                        print(f"📝 标记已存在帖子: {thread['title']} (ID: {thread_id})")
+                        print(f"📝 标记已存在帖子: {thread['title']} (ID: {thread['thread_id']})")
+                    self.mark_posts_processed([thread['thread_id'] for thread in threads])
 
                     self.first_check_completed = True
                     print(f"✅ 首次检查完成，已标记 {len(threads)} 个现有帖子")
@@ -1147,12 +1205,12 @@ class AicutForumCrawler:
 
                 # 正常监控：只处理新帖子
                 print("🚀 生产模式：只检查新帖子")
-                for thread in threads:
-                    thread_id = thread['thread_id']
+                # 一次性过滤出未处理的帖子
+                seen = self.processed_threads
+                new_threads = [thread for thread in threads if thread['thread_id'] not in seen]
 
-                    # 跳过已处理的帖子
-                    if thread_id in self.processed_threads:
-                        continue
+                for thread in new_threads:
+                    thread_id = thread['thread_id']
 
                     print(f"🆕 发现新帖子: {thread['title']} (ID: {thread_id})")
 
@@ -1192,8 +1250,8 @@ class AicutForumCrawler:
                     else:
                         print(f"⚠️ 新帖子无有效内容: {thread['title']}")
 
-                    # 生产模式：标记为已处理并立即保存
-                    self.mark_post_processed(thread_id)
+                # 生产模式：批量标记为已处理，只保存一次
+                self.mark_posts_processed([thread['thread_id'] for thread in new_threads])
 
             if new_video_posts:
                 print(f"✅ 发现 {len(new_video_posts)} 个新的视频帖子")
@@ -1261,7 +1319,8 @@ class AicutForumCrawler:
                 data=reply_data
             )
 
-            if '回复发布成功' in response.text or 'succeed' in response.text.lower():
+            body = response.content
+            if any(marker in body for marker in _FASTPOST_OK_MARKERS):
                 print(f"✅ 回复成功: {thread_id}")
                 return True
             else:
@@ -1312,19 +1371,17 @@ class AicutForumCrawler:
             return self._reply_text_only(thread_id, content)
 
     def _find_tencent_upload_button(self, soup: BeautifulSoup) -> bool:
-        """查找腾讯云上传按钮"""
+        """查找腾讯云上传按钮（命中第一个元素即返回）"""
         try:
-            # 查找可能的腾讯云上传按钮
-            tencent_buttons = soup.find_all(['button', 'input', 'a'], string=re.compile(r'腾讯云|上传|云存储', re.I))
-
-            # 查找包含腾讯云相关class或id的元素
-            tencent_elements = soup.find_all(['div', 'button', 'input'],
-                                           attrs={'class': re.compile(r'tencent|cloud|upload', re.I)})
-            tencent_elements.extend(soup.find_all(['div', 'button', 'input'],
-                                                attrs={'id': re.compile(r'tencent|cloud|upload', re.I)}))
+            # 依次查找按钮文字、class、id，任一命中即短路返回
+            found = (
+                soup.find(['button', 'input', 'a'], string=_RE_TENCENT_TEXT) or
+                soup.find(['div', 'button', 'input'], attrs={'class': _RE_TENCENT_ATTR}) or
+                soup.find(['div', 'button', 'input'], attrs={'id': _RE_TENCENT_ATTR})
+            )
 
-            if tencent_buttons or tencent_elements:
-                print(f"🔍 发现 {len(tencent_buttons)} 个腾讯云按钮，{len(tencent_elements)} 个相关元素")
+            if found:
+                print(f"🔍 发现腾讯云相关元素: <{found.name}>")
                 return True
 
             return False
@@ -1344,15 +1401,23 @@ class AicutForumCrawler:
             uploaded_files = []
 
             for video_file in video_files:
-                if not os.path.exists(video_file):
+                file_name = os.path.basename(video_file)
+
+                # 直接打开文件并 fstat 获取大小，省去 exists/getsize 的额外 stat
+                try:
+                    f = open(video_file, 'rb')
+                except FileNotFoundError:
                     print(f"⚠️ 文件不存在，跳过: {video_file}")
                     continue
-
-                file_size = os.path.getsize(video_file) / (1024 * 1024)  # MB
-                print(f"☁️ 腾讯云上传: {os.path.basename(video_file)} ({file_size:.1f} MB)")
+                except OSError as e:
+                    print(f"❌ 腾讯云上传异常: {e}")
+                    continue
 
                 try:
-                    with open(video_file, 'rb') as f:
+                    with f:
+                        file_size = os.fstat(f.fileno()).st_size / (1024 * 1024)  # MB
+                        print(f"☁️ 腾讯云上传: {file_name} ({file_size:.1f} MB)")
+
                         # 根据文件扩展名设置正确的 MIME 类型
                         import mimetypes
                         mime_type, _ = mimetypes.guess_type(video_file)
@@ -1366,10 +1431,10 @@ class AicutForumCrawler:
                             else:
                                 mime_type = 'video/mp4'  # 默认
 
-                        print(f"🧾 腾讯云上传MIME: {mime_type} -> {os.path.basename(video_file)}")
+                        print(f"🧾 腾讯云上传MIME: {mime_type} -> {file_name}")
 
                         files = {
-                            'Filedata': (os.path.basename(video_file), f, mime_type)
+                            'Filedata': (file_name, f, mime_type)
                         }
 
                         # 🎯 根据MIME类型动态设置filetype
@@ -1392,8 +1457,8 @@ class AicutForumCrawler:
 
                         if response.status_code == 200:
                             try:
-                                import json
-                                response_data = json.loads(response.text)
+                                # orjson.JSONDecodeError 继承自 json.JSONDecodeError，两种实现共用同一个 except
+                                response_data = _json_loads(response.content)
 
                                 if response_data.get('code') == 0 and 'data' in response_data:
                                     file_info = response_data['data']
@@ -1479,7 +1544,8 @@ class AicutForumCrawler:
             )
 
             # 检查回复结果
-            if '发布成功' in response.text or '回复发布成功' in response.text or 'succeed' in response.text.lower():
+            body = response.content
+            if any(marker in body for marker in _REPLY_OK_MARKERS):
                 print(f"✅ 腾讯云BBCode链接回复成功: {thread_id}")
                 print(f"📁 包含 {len(uploaded_files)} 个腾讯云BBCode链接")
 
@@ -1501,6 +1567,36 @@ class AicutForumCrawler:
             print(f"❌ 腾讯云BBCode链接回复异常: {e}")
             return False
 
+    def _post_multipart(self, url: str, data: Dict[str, Any], files: Dict[str, Tuple],
+                        timeout: int = 300) -> requests.Response:
+        """发送 multipart 表单请求
+
+        已安装 requests_toolbelt 时使用 MultipartEncoder 流式发送请求体（内存占用与文件大小无关），
+        并按 25% 进度输出上传日志；否则回退到 requests 的 files 参数。
+        """
+        if MultipartEncoder is None:
+            return self.session.post(url, data=data, files=files, timeout=timeout)
+
+        fields = {key: str(value) for key, value in data.items()}
+        fields.update(files)
+        encoder = MultipartEncoder(fields=fields)
+        total = encoder.len or 1
+        next_report = [25]
+
+        def _report_progress(monitor):
+            percent = monitor.bytes_read * 100 // total
+            if percent >= next_report[0]:
+                print(f"📶 上传进度: {percent}% ({monitor.bytes_read / (1024 * 1024):.1f} MB)")
+                next_report[0] = (percent // 25 + 1) * 25
+
+        monitor = MultipartEncoderMonitor(encoder, _report_progress)
+        return self.session.post(
+            url,
+            data=monitor,
+            headers={'Content-Type': monitor.content_type},
+            timeout=timeout
+        )
+
     def _upload_via_traditional_method(self, thread_id: str, content: str, video_files: List[str],
                                      form_hash: str) -> bool:
         """传统文件上传方式"""
@@ -1513,22 +1609,28 @@ class AicutForumCrawler:
             # 检查文件是否存在并准备上传
             valid_files = []
             for i, video_file in enumerate(video_files):
-                if os.path.exists(video_file):
-                    file_size = os.path.getsize(video_file) / (1024 * 1024)  # MB
-                    print(f"📁 准备上传文件 {i+1}: {os.path.basename(video_file)} ({file_size:.1f} MB)")
-
-                    # 不限制文件大小，直接添加到上传列表
-                    valid_files.append(video_file)
-
-                    # 准备文件上传数据
-                    file_key = f'attach_{i+1}'
-                    files[file_key] = (
-                        os.path.basename(video_file),
-                        open(video_file, 'rb'),
-                        'video/mp4'
-                    )
-                else:
+                file_name = os.path.basename(video_file)
+
+                # 直接打开文件并 fstat 获取大小，省去 exists/getsize 的额外 stat
+                try:
+                    file_obj = open(video_file, 'rb')
+                except FileNotFoundError:
                     print(f"⚠️ 文件不存在，跳过: {video_file}")
+                    continue
+
+                file_size = os.fstat(file_obj.fileno()).st_size / (1024 * 1024)  # MB
+                print(f"📁 准备上传文件 {i+1}: {file_name} ({file_size:.1f} MB)")
+
+                # 不限制文件大小，直接添加到上传列表
+                valid_files.append(video_file)
+
+                # 准备文件上传数据
+                file_key = f'attach_{i+1}'
+                files[file_key] = (
+                    file_name,
+                    file_obj,
+                    'video/mp4'
+                )
 
             if not valid_files:
                 print("⚠️ 没有有效的文件可上传，使用纯文本回复")
@@ -1547,20 +1649,21 @@ class AicutForumCrawler:
             print(f"📤 开始传统方式上传回复（包含 {len(valid_files)} 个文件）...")
 
             # 发送带附件的回复
-            response = self.session.post(
-                f"{self.base_url}/forum.php?mod=post&action=reply&tid={thread_id}",
-                data=reply_data,
-                files=files,
-                timeout=300  # 5分钟超时，因为文件上传可能需要较长时间
-            )
-
-            # 关闭文件句柄
-            for file_obj in files.values():
-                if hasattr(file_obj[1], 'close'):
+            try:
+                response = self._post_multipart(
+                    f"{self.base_url}/forum.php?mod=post&action=reply&tid={thread_id}",
+                    reply_data,
+                    files,
+                    timeout=300  # 5分钟超时，因为文件上传可能需要较长时间
+                )
+            finally:
+                # 关闭文件句柄
+                for file_obj in files.values():
                     file_obj[1].close()
 
             # 检查回复结果
-            if '发布成功' in response.text or '回复发布成功' in response.text or 'succeed' in response.text.lower():
+            body = response.content
+            if any(marker in body for marker in _REPLY_OK_MARKERS):
                 print(f"✅ 传统方式上传成功: {thread_id}")
                 print(f"📁 成功上传 {len(valid_files)} 个视频文件")
                 return True
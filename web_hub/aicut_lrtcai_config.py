@@ -9,48 +9,101 @@
 功能: AI视频剪辑自动化服务
 """
 
+import logging
 import os
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 
-# 确保 shared 可用
-REPO_ROOT = Path(__file__).resolve().parents[1]
-if str(REPO_ROOT) not in sys.path:
-    sys.path.insert(0, str(REPO_ROOT))
-
-from shared.forum_config import load_forum_settings
-
-@dataclass
+try:
+    from shared.forum_config import load_forum_settings
+except ImportError:
+    # 仅在 shared 不在导入路径中时（如直接运行本脚本）才把仓库根目录加入 sys.path
+    REPO_ROOT = Path(__file__).resolve().parents[1]
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from shared.forum_config import load_forum_settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _forum_snapshot() -> Dict[str, Any]:
+    """论坛配置快照：一次性读取论坛配置与监控相关环境变量，供各字段默认值共用
+
+    测试中修改配置或环境变量后，可调用 ``_forum_snapshot.cache_clear()`` 重新加载。
+    """
+    settings = load_forum_settings()
+    base_url = settings["forum"]["base_url"]
+    return {
+        "site_url": base_url + "/",
+        "forum_url": base_url + "/forum.php",
+        "mobile_url": base_url + "/forum.php?mobile=yes",
+        "target_forum_id": settings["forum"]["forum_id"],
+        "target_forum_url": settings["forum"]["target_url"],
+        "admin_username": settings["credentials"].get("username", ""),
+        "admin_password": settings["credentials"].get("password", ""),
+        "monitor_enabled": os.environ.get("FORUM_ENABLED", "true").lower() == "true",
+        "check_interval": int(os.environ.get("FORUM_CHECK_INTERVAL", "10")),  # 统一使用环境变量
+    }
+
+
+# 常见视频URL模式：合并为一个交替表达式，一次扫描完成匹配
+# 分组名即优先级：直链视频 > 视频平台 > 网盘链接
+_VIDEO_URL_RE = re.compile(
+    r'(?P<direct>https?://[^\s]+\.(?:mp4|avi|mov|mkv|flv|wmv|webm))'  # 直链视频
+    r'|(?P<platform>https?://[^\s]*(?:youtube|youtu\.be|bilibili|douyin)[^\s]*)'  # 视频平台
+    r'|(?P<drive>https?://[^\s]*(?:pan\.baidu|aliyundrive|123pan)[^\s]*)',  # 网盘链接
+    re.IGNORECASE,
+)
+
+# 视频关键词：合并为一个表达式，每段文本只扫描一次
+_VIDEO_KEYWORDS = ['视频', 'video', '剪辑', '口播', 'mp4', 'avi', 'mov']
+_VIDEO_KW_RE = re.compile('|'.join(map(re.escape, _VIDEO_KEYWORDS)), re.IGNORECASE)
+
+# 依赖论坛配置/环境变量的字段：构造时不读取，首次访问时再从配置快照解析
+_LAZY_FIELDS = frozenset({
+    "site_url", "forum_url", "mobile_url",
+    "target_forum_id", "target_forum_url",
+    "admin_username", "admin_password",
+    "monitor_enabled", "check_interval",
+})
+
+
+@dataclass(slots=True)
 class AicutLrtcaiConfig:
-    """懒人同城号AI网站配置"""
+    """懒人同城号AI网站配置（slots=True：不创建实例 __dict__，需 Python 3.10+）"""
     
+    # 说明：init=False 且无默认值的字段为懒加载字段（见 _LAZY_FIELDS），首次访问时由 __getattr__ 解析
+
     # 网站基本信息 - 从环境变量读取，统一配置源
     site_name: str = "懒人同城号AI-智能剪口播"
-    site_url: str = field(default_factory=lambda: load_forum_settings()["forum"]["base_url"] + "/")
+    site_url: str = field(init=False)
     site_type: str = "discuz"
     site_version: str = "X3.5"
 
     # 论坛配置 - 从环境变量读取
-    forum_url: str = field(default_factory=lambda: load_forum_settings()["forum"]["base_url"] + "/forum.php")
-    mobile_url: str = field(default_factory=lambda: load_forum_settings()["forum"]["base_url"] + "/forum.php?mobile=yes")
+    forum_url: str = field(init=False)
+    mobile_url: str = field(init=False)
 
     # 目标监控板块 - 从环境变量读取
-    target_forum_id: int = field(default_factory=lambda: load_forum_settings()["forum"]["forum_id"])
-    target_forum_url: str = field(default_factory=lambda: load_forum_settings()["forum"]["target_url"])
+    target_forum_id: int = field(init=False)
+    target_forum_url: str = field(init=False)
     target_forum_name: str = "智能剪口播"
 
     # 登录配置 - 从环境变量读取
-    admin_username: str = field(default_factory=lambda: load_forum_settings()["credentials"].get("username", ""))
-    admin_password: str = field(default_factory=lambda: load_forum_settings()["credentials"].get("password", ""))
+    admin_username: str = field(init=False)
+    admin_password: str = field(init=False)
     
     # Cookie配置（用于保持登录状态）
     cookie_file: str = "cookies/aicut_lrtcai.txt"
     
     # 监控配置 - 从环境变量读取，统一配置源
-    monitor_enabled: bool = field(default_factory=lambda: os.environ.get("FORUM_ENABLED", "true").lower() == "true")
-    check_interval: int = field(default_factory=lambda: int(os.environ.get("FORUM_CHECK_INTERVAL", "10")))  # 统一使用环境变量
+    monitor_enabled: bool = field(init=False)
+    check_interval: int = field(init=False)
     target_forums: list = None  # 监控的版块ID列表，专门监控板块2
     
     # 回复配置
@@ -86,11 +139,14 @@ class AicutLrtcaiConfig:
         
         if self.target_forums is None:
             self.target_forums = [2]  # 专门监控板块2（智能剪口播）
-        
-        # 确保cookie目录存在
-        cookie_dir = os.path.dirname(self.cookie_file)
-        if cookie_dir:
-            os.makedirs(cookie_dir, exist_ok=True)
+
+    def __getattr__(self, name: str):
+        """懒加载字段：首次访问时从配置快照读取并缓存到实例上"""
+        if name in _LAZY_FIELDS:
+            value = _forum_snapshot()[name]
+            setattr(self, name, value)
+            return value
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
 
 
 class AicutForumIntegration:
@@ -113,16 +169,16 @@ class AicutForumIntegration:
                 password=self.config.admin_password
             )
 
-            print(f"✅ 智能剪口播板块爬虫设置完成")
-            print(f"📍 监控板块: {self.config.target_forum_name} (ID: {self.config.target_forum_id})")
-            print(f"🔗 板块地址: {self.config.target_forum_url}")
+            logger.info(f"✅ 智能剪口播板块爬虫设置完成")
+            logger.info(f"📍 监控板块: {self.config.target_forum_name} (ID: {self.config.target_forum_id})")
+            logger.info(f"🔗 板块地址: {self.config.target_forum_url}")
             return True
 
         except ImportError as e:
-            print(f"❌ 导入板块爬虫失败: {e}")
+            logger.error(f"❌ 导入板块爬虫失败: {e}")
             return False
         except Exception as e:
-            print(f"❌ 设置板块爬虫失败: {e}")
+            logger.error(f"❌ 设置板块爬虫失败: {e}")
             return False
     
     def login(self):
@@ -132,58 +188,53 @@ class AicutForumIntegration:
                 success = self.aicut_crawler.login()
                 if success:
                     self.logged_in = True
-                    print(f"✅ 成功登录: {self.config.site_name}")
+                    logger.info(f"✅ 成功登录: {self.config.site_name}")
                     return True
 
-            print(f"❌ 登录失败: {self.config.site_name}")
+            logger.error(f"❌ 登录失败: {self.config.site_name}")
             return False
 
         except Exception as e:
-            print(f"❌ 登录异常: {e}")
+            logger.error(f"❌ 登录异常: {e}")
             return False
     
     def get_new_posts(self):
         """获取新帖子 - 使用专门的智能剪口播板块爬虫"""
         try:
-            print(f"🔍 监控智能剪口播板块...")
+            logger.info(f"🔍 监控智能剪口播板块...")
 
             # 使用专门的板块爬虫
             if hasattr(self, 'aicut_crawler'):
                 new_posts = self.aicut_crawler.monitor_new_posts()
 
-                # 转换为标准格式
-                video_posts = []
-                for post in new_posts:
-                    # 选择最佳的视频URL
-                    video_url = None
-                    if post['video_urls']:
-                        video_url = post['video_urls'][0]  # 使用第一个视频链接
-                    elif post['attachments']:
-                        # 使用第一个视频附件
-                        for attachment in post['attachments']:
-                            if attachment['type'] == 'video':
-                                video_url = attachment['url']
-                                break
-
-                    if video_url:
-                        video_posts.append({
-                            'post_id': post['thread_id'],
-                            'title': post['title'],
-                            'author_id': post['author'],
-                            'content': post['content'],
-                            'video_url': video_url,
-                            'post_url': post['thread_url'],
-                            'forum_name': post['forum_name']
-                        })
-
-                return video_posts
+                # 转换为标准格式（只保留能选出视频URL的帖子）
+                return [
+                    {
+                        'post_id': post['thread_id'],
+                        'title': post['title'],
+                        'author_id': post['author'],
+                        'content': post['content'],
+                        'video_url': video_url,
+                        'post_url': post['thread_url'],
+                        'forum_name': post['forum_name']
+                    }
+                    for post in new_posts
+                    if (video_url := self._pick_video_url(post))
+                ]
 
             return []
 
         except Exception as e:
-            print(f"❌ 获取新帖失败: {e}")
+            logger.error(f"❌ 获取新帖失败: {e}")
             return []
     
+    @staticmethod
+    def _pick_video_url(post: dict) -> Optional[str]:
+        """选择最佳的视频URL：优先第一个视频链接，其次第一个视频附件"""
+        if post['video_urls']:
+            return post['video_urls'][0]
+        return next((a['url'] for a in post['attachments'] if a['type'] == 'video'), None)
+
     def reply_to_post(self, post_id: str, content: str = None):
         """回复帖子"""
         try:
@@ -201,53 +252,39 @@ class AicutForumIntegration:
                 )
 
                 if success:
-                    print(f"✅ 成功回复帖子: {post_id}")
+                    logger.info(f"✅ 成功回复帖子: {post_id}")
                     return True
                 else:
-                    print(f"❌ 回复帖子失败: {post_id}")
+                    logger.error(f"❌ 回复帖子失败: {post_id}")
                     return False
 
             return False
 
         except Exception as e:
-            print(f"❌ 回复帖子异常: {e}")
+            logger.error(f"❌ 回复帖子异常: {e}")
             return False
     
     def _has_video_content(self, post: dict) -> bool:
         """检查帖子是否包含视频内容"""
-        content = post.get('message', '').lower()
-        title = post.get('subject', '').lower()
-        
-        # 检查关键词
-        video_keywords = ['视频', 'video', '剪辑', '口播', 'mp4', 'avi', 'mov']
-        
-        for keyword in video_keywords:
-            if keyword in content or keyword in title:
-                return True
-        
-        # 检查是否有视频链接
-        video_url = self._extract_video_url(post)
-        return video_url is not None
+        # 关键词忽略大小写匹配（无需 lower() 复制全文），命中则不再提取视频链接
+        return bool(
+            _VIDEO_KW_RE.search(post.get('message', '')) or
+            _VIDEO_KW_RE.search(post.get('subject', '')) or
+            self._extract_video_url(post)
+        )
     
     def _extract_video_url(self, post: dict) -> Optional[str]:
         """从帖子中提取视频URL"""
-        import re
-        
         content = post.get('message', '')
-        
-        # 常见视频URL模式
-        url_patterns = [
-            r'https?://[^\s]+\.(?:mp4|avi|mov|mkv|flv|wmv|webm)',  # 直链视频
-            r'https?://[^\s]*(?:youtube|youtu\.be|bilibili|douyin)[^\s]*',  # 视频平台
-            r'https?://[^\s]*(?:pan\.baidu|aliyundrive|123pan)[^\s]*',  # 网盘链接
-        ]
-        
-        for pattern in url_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                return matches[0]
-        
-        return None
+
+        # 单次扫描：遇到直链视频立即返回，否则按优先级返回最先出现的平台/网盘链接
+        fallback = {}
+        for match in _VIDEO_URL_RE.finditer(content):
+            if match.lastgroup == 'direct':
+                return match.group(0)
+            fallback.setdefault(match.lastgroup, match.group(0))
+
+        return fallback.get('platform') or fallback.get('drive')
 
 
 def create_aicut_config(admin_username: str = "", admin_password: str = "") -> AicutLrtcaiConfig:
@@ -262,12 +299,23 @@ def create_aicut_config(admin_username: str = "", admin_password: str = "") -> A
     return config
 
 
+def has_credentials() -> bool:
+    """是否已配置论坛管理员账号（直接读取配置快照，无需构建配置对象）"""
+    snapshot = _forum_snapshot()
+    return bool(snapshot["admin_username"] and snapshot["admin_password"])
+
+
 def test_aicut_integration():
     """测试懒人同城号AI集成"""
-    print("🧪 测试懒人同城号AI集成")
-    print("=" * 50)
+    logger.info("🧪 测试懒人同城号AI集成")
+    logger.info("=" * 50)
+    
+    # 未配置管理员账号时无法测试登录，直接跳过（不导入爬虫、不构建配置）
+    if not has_credentials():
+        logger.warning("⚠️ 未提供管理员账号，跳过登录测试")
+        return
     
-    # 创建配置（需要提供管理员账号）
+    # 创建配置
     config = create_aicut_config()
     
     # 创建集成器
@@ -275,26 +323,24 @@ def test_aicut_integration():
     
     # 测试设置
     if integration.setup_discuz_integration():
-        print("✅ Discuz集成设置成功")
+        logger.info("✅ Discuz集成设置成功")
         
         # 测试登录（需要提供真实账号）
-        if config.admin_username and config.admin_password:
-            if integration.login():
-                print("✅ 论坛登录成功")
-                
-                # 测试获取帖子
-                posts = integration.get_new_posts()
-                print(f"📝 获取到 {len(posts)} 个相关帖子")
-                
-                for post in posts[:3]:  # 显示前3个
-                    print(f"  - {post['title']} (ID: {post['post_id']})")
-            else:
-                print("❌ 论坛登录失败，请检查账号密码")
+        if integration.login():
+            logger.info("✅ 论坛登录成功")
+            
+            # 测试获取帖子
+            posts = integration.get_new_posts()
+            logger.info(f"📝 获取到 {len(posts)} 个相关帖子")
+            
+            for post in posts[:3]:  # 显示前3个
+                logger.info(f"  - {post['title']} (ID: {post['post_id']})")
         else:
-            print("⚠️ 未提供管理员账号，跳过登录测试")
+            logger.error("❌ 论坛登录失败，请检查账号密码")
     else:
-        print("❌ Discuz集成设置失败")
+        logger.error("❌ Discuz集成设置失败")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     test_aicut_integration()
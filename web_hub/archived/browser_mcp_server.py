@@ -15,27 +15,125 @@ from mcp.types import (
 )
 from mcp.server.models import InitializationOptions
 import mcp.server.stdio
-from playwright.async_api import async_playwright
 import base64
 import os
 
 app = Server("browser-control")
 
-# 全局浏览器实例
+# 全局浏览器实例：浏览器在多次 open_browser 之间复用，每次打开新建上下文和页面
 browser = None
+browser_headless = None
 page = None
 
+# close_browser 时是否保留浏览器进程（仅关闭页面），便于下次快速打开
+KEEP_BROWSER_ALIVE = os.environ.get("BROWSER_MCP_KEEP_ALIVE", "").lower() in ("1", "true", "yes")
+
+# Playwright 驱动：首次打开浏览器时才导入并启动，之后复用同一个驱动进程
+_playwright = None
+
+
+async def _get_playwright():
+    """获取（必要时启动）共享的 Playwright 驱动"""
+    global _playwright
+    if _playwright is None:
+        from playwright.async_api import async_playwright
+        _playwright = await async_playwright().start()
+    return _playwright
+
+# 资源和工具列表内容固定，导入时构建一次，list_resources/list_tools 直接返回
+_RESOURCES = [
+    Resource(
+        uri="browser://current-page",
+        name="Current Browser Page",
+        description="Currently open browser page",
+        mimeType="text/html",
+    )
+]
+
+_TOOLS = [
+    Tool(
+        name="open_browser",
+        description="打开浏览器并导航到指定URL",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "url": {
+                    "type": "string",
+                    "description": "要访问的URL"
+                },
+                "headless": {
+                    "type": "boolean",
+                    "description": "是否以无头模式运行浏览器",
+                    "default": False
+                }
+            },
+            "required": ["url"]
+        }
+    ),
+    Tool(
+        name="take_screenshot",
+        description="截取当前页面的屏幕截图",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "保存截图的路径(可选)",
+                    "default": None
+                }
+            }
+        }
+    ),
+    Tool(
+        name="get_page_source",
+        description="获取当前页面的HTML源代码",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="click_element",
+        description="点击页面上的元素",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "selector": {
+                    "type": "string",
+                    "description": "CSS选择器或XPath"
+                }
+            },
+            "required": ["selector"]
+        }
+    ),
+    Tool(
+        name="refresh_page",
+        description="刷新当前页面",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "force": {
+                    "type": "boolean",
+                    "description": "是否强制刷新（忽略缓存）",
+                    "default": False
+                }
+            }
+        }
+    ),
+    Tool(
+        name="close_browser",
+        description="关闭浏览器",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    )
+]
+
 @app.list_resources()
 async def handle_list_resources() -> list[Resource]:
     """列出可用的资源"""
-    return [
-        Resource(
-            uri="browser://current-page",
-            name="Current Browser Page",
-            description="Currently open browser page",
-            mimeType="text/html",
-        )
-    ]
+    return _RESOURCES
 
 @app.read_resource()
 async def handle_read_resource(uri: str) -> str:
@@ -52,99 +150,35 @@ async def handle_read_resource(uri: str) -> str:
 @app.list_tools()
 async def handle_list_tools() -> list[Tool]:
     """列出可用的工具"""
-    return [
-        Tool(
-            name="open_browser",
-            description="打开浏览器并导航到指定URL",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "url": {
-                        "type": "string",
-                        "description": "要访问的URL"
-                    },
-                    "headless": {
-                        "type": "boolean",
-                        "description": "是否以无头模式运行浏览器",
-                        "default": False
-                    }
-                },
-                "required": ["url"]
-            }
-        ),
-        Tool(
-            name="take_screenshot",
-            description="截取当前页面的屏幕截图",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "保存截图的路径(可选)",
-                        "default": None
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="get_page_source",
-            description="获取当前页面的HTML源代码",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="click_element",
-            description="点击页面上的元素",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "selector": {
-                        "type": "string",
-                        "description": "CSS选择器或XPath"
-                    }
-                },
-                "required": ["selector"]
-            }
-        ),
-        Tool(
-            name="refresh_page",
-            description="刷新当前页面",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "force": {
-                        "type": "boolean",
-                        "description": "是否强制刷新（忽略缓存）",
-                        "default": False
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="close_browser",
-            description="关闭浏览器",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        )
-    ]
+    return _TOOLS
 
 @app.call_tool()
 async def handle_call_tool(name: str, arguments: dict[str, Any] | None) -> list[TextContent | ImageContent | EmbeddedResource]:
     """处理工具调用"""
-    global browser, page
+    global browser, browser_headless, page
     
     if name == "open_browser":
         url = arguments.get("url") if arguments else "about:blank"
         headless = arguments.get("headless", False) if arguments else False
         
         try:
-            playwright = await async_playwright().start()
-            browser = await playwright.chromium.launch(headless=headless)
-            page = await browser.new_page()
+            # 无头模式不同需要重新启动浏览器
+            if browser and browser_headless != headless:
+                await browser.close()
+                browser = None
+
+            if not browser:
+                playwright = await _get_playwright()
+                browser = await playwright.chromium.launch(headless=headless)
+                browser_headless = headless
+
+            # 关闭上一个页面的上下文，再为本次打开新建上下文
+            if page:
+                await page.context.close()
+                page = None
+
+            context = await browser.new_context()
+            page = await context.new_page()
             await page.goto(url)
             
             return [
@@ -175,11 +209,9 @@ async def handle_call_tool(name: str, arguments: dict[str, Any] | None) -> list[
             if not path:
                 path = "screenshot.png"
             
-            await page.screenshot(path=path)
-            
-            # 读取截图并转换为base64
-            with open(path, "rb") as f:
-                image_data = base64.b64encode(f.read()).decode()
+            # screenshot() 写入文件的同时返回PNG字节，直接编码，无需再读回文件
+            png_bytes = await page.screenshot(path=path)
+            image_data = base64.b64encode(png_bytes).decode()
             
             return [
                 TextContent(
@@ -211,10 +243,15 @@ async def handle_call_tool(name: str, arguments: dict[str, Any] | None) -> list[
         
         try:
             content = await page.content()
+            # 前缀单独作为一项返回，避免为拼接复制整份页面源代码
             return [
                 TextContent(
                     type="text",
-                    text=f"页面源代码:\n{content}"
+                    text="页面源代码:"
+                ),
+                TextContent(
+                    type="text",
+                    text=content
                 )
             ]
         except Exception as e:
@@ -271,7 +308,14 @@ async def handle_call_tool(name: str, arguments: dict[str, Any] | None) -> list[
         try:
             force = arguments.get("force", False) if arguments else False
             if force:
-                await page.reload()
+                # Chromium没有原生的强制刷新：通过CDP临时禁用缓存后再reload
+                cdp = await page.context.new_cdp_session(page)
+                try:
+                    await cdp.send("Network.setCacheDisabled", {"cacheDisabled": True})
+                    await page.reload()
+                finally:
+                    await cdp.send("Network.setCacheDisabled", {"cacheDisabled": False})
+                    await cdp.detach()
             else:
                 await page.reload()
             
@@ -291,10 +335,13 @@ async def handle_call_tool(name: str, arguments: dict[str, Any] | None) -> list[
     
     elif name == "close_browser":
         try:
-            if browser:
+            if page:
+                await page.context.close()
+                page = None
+
+            if browser and not KEEP_BROWSER_ALIVE:
                 await browser.close()
                 browser = None
-                page = None
             
             return [
                 TextContent(
@@ -4,52 +4,65 @@
 避免编码问题，专注核心功能检测
 """
 
-import socket
+import logging
 import sys
 
+logger = logging.getLogger(__name__)
+
+# 模块级连接池（首次使用时创建），导入本模块的调用方共享同一个连接池
+_POOL = None
+
+
+def _client():
+    """获取使用共享连接池的Redis客户端"""
+    global _POOL
+    import redis
+
+    if _POOL is None:
+        _POOL = redis.ConnectionPool(host='localhost', port=6379, db=1, socket_timeout=3,
+                                      socket_connect_timeout=3, max_connections=4)
+    return redis.Redis(connection_pool=_POOL)
+
 
 def check_python_redis():
     """检查Python Redis包"""
     try:
         import redis
-        print(f"✅ Python redis包已安装 (版本: {redis.__version__})")
+        logger.info(f"✅ Python redis包已安装 (版本: {redis.__version__})")
         return True
     except ImportError:
-        print("❌ Python redis包未安装")
-        print("   安装命令: pip install redis")
+        logger.error("❌ Python redis包未安装")
+        logger.info("   安装命令: pip install redis")
         return False
 
 
 def check_redis_service():
-    """检查Redis服务是否运行"""
+    """检查Redis服务是否运行（一次 PING 同时验证端口与认证）"""
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(3)
-        result = sock.connect_ex(('localhost', 6379))
-        sock.close()
-        
-        if result == 0:
-            print("✅ Redis服务正在运行 (端口6379)")
-            return True
-        else:
-            print("❌ Redis服务未运行 (端口6379)")
-            return False
+        import redis
+
+        _client().ping()
+        logger.info("✅ Redis服务正在运行 (端口6379)")
+        return True
+    except ImportError:
+        logger.error("❌ 无法检查Redis服务: Python redis包未安装")
+        return False
+    except redis.AuthenticationError as e:
+        logger.error(f"❌ Redis服务正在运行，但认证失败: {e}")
+        return False
+    except (redis.ConnectionError, redis.TimeoutError):
+        logger.error("❌ Redis服务未运行 (端口6379)")
+        return False
     except Exception as e:
-        print(f"❌ 检查Redis服务失败: {e}")
+        logger.error(f"❌ 检查Redis服务失败: {e}")
         return False
 
 
 def test_redis_connection():
     """测试Redis连接和读写"""
     try:
-        import redis
-        
-        # 连接Redis
-        client = redis.Redis(host='localhost', port=6379, db=1, socket_timeout=3)
-        
-        # 测试ping
-        client.ping()
-        print("✅ Redis连接成功")
+        # 连接Redis（连通性已由 check_redis_service 的 PING 验证）
+        client = _client()
         
         # 测试读写
         test_key = "test_monitor_system"
@@ -59,25 +72,25 @@ def test_redis_connection():
         retrieved = client.get(test_key)
         
         if retrieved and retrieved.decode() == test_value:
-            print("✅ Redis读写测试成功")
+            logger.info("✅ Redis读写测试成功")
             client.delete(test_key)  # 清理
             return True
         else:
-            print("❌ Redis读写测试失败")
+            logger.error("❌ Redis读写测试失败")
             return False
             
     except ImportError:
-        print("❌ 无法测试: Python redis包未安装")
+        logger.error("❌ 无法测试: Python redis包未安装")
         return False
     except Exception as e:
-        print(f"❌ Redis连接失败: {e}")
+        logger.error(f"❌ Redis连接失败: {e}")
         return False
 
 
 def main():
     """主检测函数"""
-    print("🔍 Redis 快速检测")
-    print("=" * 40)
+    logger.info("🔍 Redis 快速检测")
+    logger.info("=" * 40)
     
     # 检测结果
     python_ok = check_python_redis()
@@ -88,44 +101,45 @@ def main():
         connection_ok = test_redis_connection()
     
     # 总结
-    print("\n📊 检测结果:")
-    print("=" * 40)
+    logger.info("\n📊 检测结果:")
+    logger.info("=" * 40)
     
     if python_ok and service_ok and connection_ok:
-        print("🎉 Redis完全可用!")
-        print("✅ Python包: 已安装")
-        print("✅ Redis服务: 正在运行")
-        print("✅ 连接测试: 成功")
-        print("\n🚀 可以启动监控系统:")
-        print("   python start_standalone.py")
+        logger.info("🎉 Redis完全可用!")
+        logger.info("✅ Python包: 已安装")
+        logger.info("✅ Redis服务: 正在运行")
+        logger.info("✅ 连接测试: 成功")
+        logger.info("\n🚀 可以启动监控系统:")
+        logger.info("   python start_standalone.py")
         return True
         
     elif python_ok and service_ok:
-        print("⚠️ Redis基本可用，但连接测试失败")
-        print("✅ Python包: 已安装")
-        print("✅ Redis服务: 正在运行")
-        print("❌ 连接测试: 失败")
-        print("\n🔧 请检查Redis配置")
+        logger.warning("⚠️ Redis基本可用，但连接测试失败")
+        logger.info("✅ Python包: 已安装")
+        logger.info("✅ Redis服务: 正在运行")
+        logger.info("❌ 连接测试: 失败")
+        logger.info("\n🔧 请检查Redis配置")
         return False
         
     else:
-        print("❌ Redis不完全可用")
-        print(f"{'✅' if python_ok else '❌'} Python包")
-        print(f"{'✅' if service_ok else '❌'} Redis服务")
-        print(f"{'✅' if connection_ok else '❌'} 连接测试")
+        logger.error("❌ Redis不完全可用")
+        logger.info(f"{'✅' if python_ok else '❌'} Python包")
+        logger.info(f"{'✅' if service_ok else '❌'} Redis服务")
+        logger.info(f"{'✅' if connection_ok else '❌'} 连接测试")
         
-        print("\n📖 解决方案:")
+        logger.info("\n📖 解决方案:")
         if not python_ok:
-            print("1. 安装Python Redis包: pip install redis")
+            logger.info("1. 安装Python Redis包: pip install redis")
         if not service_ok:
-            print("2. 启动Redis服务:")
-            print("   Windows: redis-server")
-            print("   Linux: sudo systemctl start redis-server")
-            print("   macOS: brew services start redis")
+            logger.info("2. 启动Redis服务:")
+            logger.info("   Windows: redis-server")
+            logger.info("   Linux: sudo systemctl start redis-server")
+            logger.info("   macOS: brew services start redis")
         
         return False
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     success = main()
     sys.exit(0 if success else 1)
@@ -6,88 +6,128 @@
 import os
 import sys
 import io
-from pathlib import Path
 from dotenv import load_dotenv
 
 # Fix Windows console encoding for emoji support
+# (skip streams that are already UTF-8, e.g. PYTHONIOENCODING=utf-8 or UTF-8 mode)
 if sys.platform == 'win32':
-    try:
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
-    except (AttributeError, io.UnsupportedOperation):
-        # If stdout/stderr don't have buffer attribute, skip
-        pass
+    for _stream in (sys.stdout, sys.stderr):
+        if (getattr(_stream, 'encoding', None) or '').lower().replace('-', '') == 'utf8':
+            continue
+        try:
+            _stream.reconfigure(encoding='utf-8', errors='replace')
+        except (AttributeError, io.UnsupportedOperation):
+            # If stdout/stderr can't be reconfigured, skip
+            pass
 
 # 确保 shared 可导入
-REPO_ROOT = Path(__file__).resolve().parents[2]
-if str(REPO_ROOT) not in sys.path:
-    sys.path.insert(0, str(REPO_ROOT))
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))  # 纯字符串运算，不访问文件系统
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
 
 from shared.forum_config import load_forum_settings
 
-# 加载.env文件
-load_dotenv()
+# 加载.env文件（哨兵保证只读取一次；load_forum_settings 本身已由 lru_cache 缓存）
+_DOTENV_LOADED = False
+
+
+def _load_dotenv_once():
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+
+_load_dotenv_once()
 
 
 class MonitorConfig:
     """监控器配置"""
-    
+
+    # 布尔配置：(属性名, 环境变量名, 默认值)
+    _BOOL_FIELDS = (
+        ('FORUM_MONITORING_ENABLED', 'FORUM_ENABLED', 'true'),
+        ('FORUM_AUTO_REPLY_ENABLED', 'FORUM_AUTO_REPLY_ENABLED', 'true'),
+        ('FORUM_TEST_MODE', 'FORUM_TEST_MODE', 'false'),
+        ('FORUM_TEST_ONCE', 'FORUM_TEST_ONCE', 'false'),
+    )
+
+    # 整数配置：(属性名, 环境变量名, 默认值)
+    _INT_FIELDS = (
+        ('MAX_POSTS_TO_PROCESS', 'MAX_POSTS_TO_PROCESS', '50'),
+        ('REQUEST_TIMEOUT', 'REQUEST_TIMEOUT', '30'),  # 请求超时(秒)
+        ('MAX_RETRIES', 'MAX_RETRIES', '3'),  # 最大重试次数
+        ('WEB_REFRESH_INTERVAL', 'WEB_REFRESH_INTERVAL', '10'),  # 页面刷新间隔(秒)
+        ('LOCAL_QUEUE_HIGHWATER', 'LOCAL_QUEUE_HIGHWATER', '0'),  # hybrid 模式下本地队列积压低于该值时优先排入本地队列（0 = 集群优先）
+    )
+
+    # 分发模式显示名称
+    _DISPATCH_MODE_LABELS = {
+        'cluster': '集群节点',
+        'local': '本地队列',
+        'hybrid': '集群优先 + 本地兜底'
+    }
+
+    # 默认关键词（FORUM_KEYWORDS 未设置时使用）
+    _DEFAULT_KEYWORDS = ('视频', '音频', '处理', '剪辑')
+
+    # 常见的默认/弱密码
+    _WEAK_PASSWORDS = frozenset({'your_password_here', 'your_secure_password_here', 'password', '123456', 'admin'})
+
     def __init__(self):
+        # 环境变量只取一次引用，后续统一通过 g() 读取
+        env = os.environ
+        g = env.get
+
+        # 布尔/整数配置：按表批量解析
+        for name, key, default in self._BOOL_FIELDS:
+            setattr(self, name, g(key, default).lower() == 'true')
+        for name, key, default in self._INT_FIELDS:
+            setattr(self, name, int(g(key, default)))
+
         # 基本配置 - 使用.env文件中的FORUM_CHECK_INTERVAL
-        self.CHECK_INTERVAL = int(os.getenv('FORUM_CHECK_INTERVAL', os.getenv('CHECK_INTERVAL', '10')))  # 检查间隔(秒)
-        self.FORUM_MONITORING_ENABLED = os.getenv('FORUM_ENABLED', 'true').lower() == 'true'
+        self.CHECK_INTERVAL = int(self._first_set(env, ('FORUM_CHECK_INTERVAL', 'CHECK_INTERVAL'), '10'))  # 检查间隔(秒)
 
         # 论坛网站配置 - 从.env文件读取
         forum_settings = load_forum_settings()
         forum_cfg = forum_settings.get('forum', {})
         credentials_cfg = forum_settings.get('credentials', {})
 
-        self.FORUM_BASE_URL = os.getenv('FORUM_BASE_URL') or forum_cfg["base_url"]
-        self.FORUM_TARGET_URL = os.getenv('FORUM_TARGET_URL') or forum_cfg["target_url"]
-        self.FORUM_USERNAME = os.getenv('FORUM_USERNAME', os.getenv('AICUT_ADMIN_USERNAME', credentials_cfg.get('username', '')))
-        self.FORUM_PASSWORD = os.getenv('FORUM_PASSWORD', os.getenv('AICUT_ADMIN_PASSWORD', credentials_cfg.get('password', '')))
-        self.FORUM_TARGET_FORUM_ID = int(os.getenv('FORUM_TARGET_FORUM_ID') or forum_cfg["forum_id"])
-
-        # 论坛功能配置
-        self.FORUM_AUTO_REPLY_ENABLED = os.getenv('FORUM_AUTO_REPLY_ENABLED', 'true').lower() == 'true'
-        self.FORUM_TEST_MODE = os.getenv('FORUM_TEST_MODE', 'false').lower() == 'true'
-        self.FORUM_TEST_ONCE = os.getenv('FORUM_TEST_ONCE', 'false').lower() == 'true'
+        self.FORUM_BASE_URL = g('FORUM_BASE_URL') or forum_cfg["base_url"]
+        self.FORUM_TARGET_URL = g('FORUM_TARGET_URL') or forum_cfg["target_url"]
+        self.FORUM_USERNAME = self._first_set(env, ('FORUM_USERNAME', 'AICUT_ADMIN_USERNAME'), credentials_cfg.get('username', ''))
+        self.FORUM_PASSWORD = self._first_set(env, ('FORUM_PASSWORD', 'AICUT_ADMIN_PASSWORD'), credentials_cfg.get('password', ''))
+        self.FORUM_TARGET_FORUM_ID = int(g('FORUM_TARGET_FORUM_ID') or forum_cfg["forum_id"])
 
         # 爬虫配置
-        self.CRAWLER_MODE = os.getenv('CRAWLER_MODE', 'TEST')
-        self.MAX_POSTS_TO_PROCESS = int(os.getenv('MAX_POSTS_TO_PROCESS', '50'))
-
-        # 网络配置
-        self.REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '30'))  # 请求超时(秒)
-        self.MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))  # 最大重试次数
+        self.CRAWLER_MODE = g('CRAWLER_MODE', 'TEST')
 
         # 任务分发配置
-        self.TASK_DISPATCH_STRATEGY = os.getenv('TASK_DISPATCH_STRATEGY', 'least_busy')  # 分发策略
+        self.TASK_DISPATCH_STRATEGY = g('TASK_DISPATCH_STRATEGY', 'least_busy')  # 分发策略
         # 可选值: 'least_busy', 'priority', 'round_robin'
-        self.TASK_DISPATCH_MODE = os.getenv('TASK_DISPATCH_MODE', 'cluster').lower()
-        if self.TASK_DISPATCH_MODE not in {'cluster', 'local', 'hybrid'}:
+        self.TASK_DISPATCH_MODE = g('TASK_DISPATCH_MODE', 'cluster').lower()
+        if self.TASK_DISPATCH_MODE not in self._DISPATCH_MODE_LABELS:
             print(f"⚠️ 未知的 TASK_DISPATCH_MODE: {self.TASK_DISPATCH_MODE}，将退回 cluster")
             self.TASK_DISPATCH_MODE = 'cluster'
 
         # 日志配置
-        self.LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-        self.LOG_FILE = os.getenv('LOG_FILE', 'logs/forum_monitor.log')
+        self.LOG_LEVEL = g('LOG_LEVEL', 'INFO')
+        self.LOG_FILE = g('LOG_FILE', 'logs/forum_monitor.log')
+        self.LOG_DIR = os.path.dirname(self.LOG_FILE)
 
         # 论坛配置（兼容旧版本）
-        self.FORUM_URLS = self._parse_forum_urls()
-        self.FORUM_CHECK_KEYWORDS = self._parse_keywords()
+        self.FORUM_URLS = self._parse_forum_urls(env)
+        self.FORUM_CHECK_KEYWORDS = self._parse_keywords(env)
 
         # 机器配置
-        self.MACHINES_CONFIG_FILE = os.getenv('MACHINES_CONFIG_FILE', 'machines.txt')
+        self.MACHINES_CONFIG_FILE = g('MACHINES_CONFIG_FILE', 'machines.txt')
 
-        # Web界面配置
-        self.WEB_REFRESH_INTERVAL = int(os.getenv('WEB_REFRESH_INTERVAL', '10'))  # 页面刷新间隔(秒)
-
-        # 验证配置安全性
+        # 验证配置安全性（结果保存在 security_errors / security_warnings）
         self._validate_security()
-        
-        # 打印配置信息
-        self._print_config_info()
+
+        # 打印安全检查结果和配置信息；CONFIG_QUIET=true 时不输出，可稍后调用 report()
+        if g('CONFIG_QUIET', 'false').lower() != 'true':
+            self.report()
     
     def _validate_security(self):
         """验证配置安全性"""
@@ -102,80 +142,106 @@ class MonitorConfig:
             # 检查密码安全性
             if not self.FORUM_PASSWORD:
                 errors.append("论坛密码未配置")
-            elif self.FORUM_PASSWORD in ['your_password_here', 'your_secure_password_here', 'password', '123456', 'admin']:
+            elif self.FORUM_PASSWORD in self._WEAK_PASSWORDS:
                 errors.append("请设置安全的论坛密码，当前使用的是默认密码")
             elif len(self.FORUM_PASSWORD) < 8:
                 warnings.append("建议密码长度至少8位")
             elif self.FORUM_PASSWORD.isdigit():
                 warnings.append("建议密码包含字母和数字组合")
-        
-        # 输出安全检查结果
+
+        self.security_errors = errors
+        self.security_warnings = warnings
+
+    def report(self):
+        """输出安全检查结果和配置信息"""
+        self._print_security_result()
+        self._print_config_info()
+
+    def _print_security_result(self):
+        """输出安全检查结果（拼成一次写入）"""
+        errors = self.security_errors
+        warnings = self.security_warnings
+        lines = []
         if errors:
-            print("🚨 安全检查失败:")
-            for error in errors:
-                print(f"   ❌ {error}")
-            print("💡 请修改 .env 文件中的配置后重新启动")
-        
+            lines.append("🚨 安全检查失败:")
+            lines.extend(f"   ❌ {error}" for error in errors)
+            lines.append("💡 请修改 .env 文件中的配置后重新启动")
+
         if warnings:
-            print("⚠️ 安全建议:")
-            for warning in warnings:
-                print(f"   🔶 {warning}")
-        
+            lines.append("⚠️ 安全建议:")
+            lines.extend(f"   🔶 {warning}" for warning in warnings)
+
         if not errors and not warnings:
-            print("🔒 安全检查通过")
-    
+            lines.append("🔒 安全检查通过")
+
+        sys.stdout.write("\n".join(lines) + "\n")
+
     def _print_config_info(self):
         """打印配置信息（隐藏敏感信息）"""
-        print("📋 集群监控器配置:")
+        lines = ["📋 集群监控器配置:"]
 
         # 只显示启用的功能，禁用的功能不显示
         if self.FORUM_MONITORING_ENABLED:
-            print(f"   - 论坛监控: ✅ 启用")
-            print(f"   - 目标论坛: {self.FORUM_BASE_URL}")
-            print(f"   - 目标板块: {self.FORUM_TARGET_URL}")
-            
             # 🔒 安全处理：隐藏敏感用户信息
             if self.FORUM_USERNAME:
                 username_display = f"{self.FORUM_USERNAME[:2]}***{self.FORUM_USERNAME[-1:]}" if len(self.FORUM_USERNAME) > 3 else "***"
-                print(f"   - 监控用户: {username_display}")
             else:
-                print(f"   - 监控用户: ❌ 未配置")
-            
+                username_display = "❌ 未配置"
+
             # 🔒 安全处理：隐藏密码，只显示状态
             password_status = "✅ 已配置" if self.FORUM_PASSWORD and self.FORUM_PASSWORD != 'your_secure_password_here' else "❌ 未配置"
-            print(f"   - 密码状态: {password_status}")
-            
-            print(f"   - 检查间隔: {self.CHECK_INTERVAL}秒")
+
+            lines += [
+                "   - 论坛监控: ✅ 启用",
+                f"   - 目标论坛: {self.FORUM_BASE_URL}",
+                f"   - 目标板块: {self.FORUM_TARGET_URL}",
+                f"   - 监控用户: {username_display}",
+                f"   - 密码状态: {password_status}",
+                f"   - 检查间隔: {self.CHECK_INTERVAL}秒",
+            ]
 
             # 只在测试模式时显示
             if self.FORUM_TEST_MODE:
-                print(f"   - 测试模式: ✅ 是")
+                lines.append("   - 测试模式: ✅ 是")
 
             # 只在启用自动回复时显示
             if self.FORUM_AUTO_REPLY_ENABLED:
-                print(f"   - 自动回复: ✅ 启用")
+                lines.append("   - 自动回复: ✅ 启用")
+
+            lines.append(f"   - 分发模式: {self._DISPATCH_MODE_LABELS.get(self.TASK_DISPATCH_MODE, '集群节点')}")
+
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    @staticmethod
+    def _first_set(env, keys, default=''):
+        """按顺序返回第一个非空的环境变量值，都未设置时返回默认值"""
+        for key in keys:
+            value = env.get(key)
+            if value:
+                return value
+        return default
 
-            dispatch_mode_map = {
-                'cluster': '集群节点',
-                'local': '本地队列',
-                'hybrid': '集群优先 + 本地兜底'
-            }
-            print(f"   - 分发模式: {dispatch_mode_map.get(self.TASK_DISPATCH_MODE, '集群节点')}")
+    @staticmethod
+    def _split_csv(value: str) -> tuple:
+        """按逗号拆分并去除空白项"""
+        return tuple(part for part in (item.strip() for item in value.split(',')) if part) if value else ()
 
-    def _parse_forum_urls(self):
+    def _parse_forum_urls(self, env=os.environ):
         """解析论坛URL配置（兼容旧版本）"""
-        urls_str = os.getenv('FORUM_URLS', '')
-        if urls_str:
-            return [url.strip() for url in urls_str.split(',') if url.strip()]
+        urls = self._split_csv(env.get('FORUM_URLS', ''))
+        if urls:
+            return urls
         # 如果没有配置FORUM_URLS，使用新的配置
         if self.FORUM_TARGET_URL:
-            return [self.FORUM_TARGET_URL]
-        return []
+            return (self.FORUM_TARGET_URL,)
+        return ()
     
-    def _parse_keywords(self):
+    def _parse_keywords(self, env=os.environ):
         """解析关键词配置"""
-        keywords_str = os.getenv('FORUM_KEYWORDS', '视频,音频,处理,剪辑')
-        return [kw.strip() for kw in keywords_str.split(',') if kw.strip()]
+        keywords_str = env.get('FORUM_KEYWORDS')
+        if keywords_str is None:
+            return self._DEFAULT_KEYWORDS
+        return self._split_csv(keywords_str)
     
     def get_task_dispatch_strategy(self):
         """获取任务分发策略"""
@@ -211,8 +277,8 @@ class MonitorConfig:
             'max_retries': self.MAX_RETRIES,
             'task_dispatch_strategy': self.TASK_DISPATCH_STRATEGY,
             'log_level': self.LOG_LEVEL,
-            'forum_urls': self.FORUM_URLS,
-            'forum_keywords': self.FORUM_CHECK_KEYWORDS,
+            'forum_urls': list(self.FORUM_URLS),
+            'forum_keywords': list(self.FORUM_CHECK_KEYWORDS),
             'web_refresh_interval': self.WEB_REFRESH_INTERVAL
         }
 
@@ -220,6 +286,9 @@ class MonitorConfig:
 class ConfigManager:
     """统一配置管理器"""
 
+    # 本进程内已创建/确认存在的目录
+    _dirs_ready = set()
+
     @staticmethod
     def load_env_file(env_file: str = ".env"):
         """加载环境变量文件"""
@@ -259,6 +328,8 @@ MAX_RETRIES=3
 # 日志配置
 LOG_LEVEL=INFO
 LOG_FILE=logs/forum_monitor.log
+# 设为 true 时启动不打印配置信息（无人值守的工作进程）
+CONFIG_QUIET=false
 
 # Web界面配置
 WEB_REFRESH_INTERVAL=10
@@ -351,9 +422,9 @@ localhost:8004:2    # 本地工作节点2 - 中等优先级
             errors.append("MAX_RETRIES 不能小于0")
 
         # 检查文件路径
-        if not os.path.exists(os.path.dirname(config.LOG_FILE)):
+        if not os.path.exists(config.LOG_DIR):
             try:
-                os.makedirs(os.path.dirname(config.LOG_FILE), exist_ok=True)
+                os.makedirs(config.LOG_DIR, exist_ok=True)
             except Exception as e:
                 errors.append(f"无法创建日志目录: {e}")
 
@@ -366,19 +437,20 @@ localhost:8004:2    # 本地工作节点2 - 中等优先级
             print("✅ 配置验证通过")
             return True
 
-    @staticmethod
-    def setup_directories(config: MonitorConfig):
-        """创建必要的目录"""
+    @classmethod
+    def setup_directories(cls, config: MonitorConfig):
+        """创建必要的目录（本进程内已确认过的目录不再重复处理）"""
         directories = [
-            os.path.dirname(config.LOG_FILE),
+            config.LOG_DIR,
             'data',
             'templates',
             'static/css'
         ]
 
         for directory in directories:
-            if directory:  # 避免空字符串
+            if directory and directory not in cls._dirs_ready:  # 避免空字符串
                 os.makedirs(directory, exist_ok=True)
+                cls._dirs_ready.add(directory)
                 print(f"📁 确保目录存在: {directory}")
 
 
@@ -386,3 +458,14 @@ localhost:8004:2    # 本地工作节点2 - 中等优先级
 config_manager = ConfigManager()
 
 # 默认配置实例（延迟实例化，避免导入时进行安全检查）
+_default_config = None
+
+
+def __getattr__(name):
+    """模块级懒加载（PEP 562）：首次访问 default_config 时才创建 MonitorConfig"""
+    global _default_config
+    if name == 'default_config':
+        if _default_config is None:
+            _default_config = MonitorConfig()
+        return _default_config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,9 +4,17 @@
 合并了分散在各个文件中的依赖检查逻辑
 """
 
+import os
 import sys
+import socket
 import subprocess
-from typing import List, Tuple, Dict
+import importlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Sequence
+
+# 平台判断在导入时确定一次（sys.platform 是预先计算好的字符串）
+_IS_WINDOWS = sys.platform.startswith('win')
 
 
 class DependencyManager:
@@ -14,7 +22,7 @@ class DependencyManager:
 
     # 定义不同模式的依赖包
     PACKAGE_GROUPS = {
-        'base': [
+        'base': (
             ('flask', 'Flask'),
             ('werkzeug', 'Werkzeug'),
             ('requests', 'requests'),
@@ -23,51 +31,64 @@ class DependencyManager:
             ('psutil', 'psutil'),
             ('bs4', 'beautifulsoup4'),
             ('lxml', 'lxml')
-        ],
-        'production': [
+        ),
+        'production': (
             ('waitress', 'waitress'),  # Windows推荐
             ('gunicorn', 'gunicorn')   # Unix推荐
-        ],
-        'optional': [
-            ('redis', 'redis')
-        ],
-        'cluster_monitor': [
-            ('flask', 'Flask'),
-            ('werkzeug', 'Werkzeug'),
-            ('requests', 'requests'),
-            ('urllib3', 'urllib3'),
-            ('dotenv', 'python-dotenv'),
-            ('psutil', 'psutil'),
-            ('bs4', 'beautifulsoup4'),
-            ('lxml', 'lxml'),
+        ),
+        'optional': (
             ('redis', 'redis'),
-            ('waitress', 'waitress')
-        ]
+        )
     }
+    # 集群监控 = 基础包 + 可选包 + waitress，直接复用上面的列表
+    PACKAGE_GROUPS['cluster_monitor'] = (
+        PACKAGE_GROUPS['base'] + PACKAGE_GROUPS['optional'] + (('waitress', 'waitress'),)
+    )
+
+    # 生产模式：基础包 + 当前系统推荐的WSGI服务器（Windows用waitress，Unix用gunicorn）
+    PRODUCTION_PACKAGES = PACKAGE_GROUPS['base'] + (
+        (('waitress', 'waitress'),) if _IS_WINDOWS else (('gunicorn', 'gunicorn'),)
+    )
 
     def __init__(self):
         self.results = {}
+        self._probe_cache: Dict[str, bool] = {}
+
+    def _probe(self, import_name: str) -> bool:
+        """查找模块规格（不执行模块代码），结果按模块名缓存"""
+        module_name = import_name.replace('-', '_')
+        found = self._probe_cache.get(module_name)
+        if found is None:
+            try:
+                found = importlib.util.find_spec(module_name) is not None
+            except (ImportError, ValueError):
+                found = False
+            self._probe_cache[module_name] = found
+        return found
 
     def check_package(self, import_name: str, package_name: str) -> bool:
         """检查单个包是否安装"""
-        try:
-            __import__(import_name.replace('-', '_'))
-            print(f"✅ {package_name}")
-            return True
-        except ImportError:
-            print(f"❌ {package_name}")
-            return False
+        found = self._probe(import_name)
+        print(f"{'✅' if found else '❌'} {package_name}")
+        return found
 
-    def check_packages(self, packages: List[Tuple[str, str]]) -> Tuple[bool, List[str], List[str]]:
+    def check_packages(self, packages: Sequence[Tuple[str, str]]) -> Tuple[bool, List[str], List[str]]:
         """
         检查多个包是否安装
 
         Args:
-            packages: 包列表，格式为 [(import_name, package_name), ...]
+            packages: 包序列，格式为 ((import_name, package_name), ...)
 
         Returns:
             (success: bool, missing: list, installed: list)
         """
+        # 未缓存的包并行探测（主要是文件系统查找），随后按原顺序输出结果
+        pending = [import_name for import_name, _ in packages
+                   if import_name.replace('-', '_') not in self._probe_cache]
+        if len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+                list(executor.map(self._probe, pending))
+
         missing = []
         installed = []
 
@@ -79,60 +100,51 @@ class DependencyManager:
 
         return len(missing) == 0, missing, installed
 
+    def _check_cached(self, key: str, packages: Sequence[Tuple[str, str]]) -> Tuple[bool, List[str], List[str]]:
+        """检查包列表，并按 key 缓存结果"""
+        if key not in self.results:
+            self.results[key] = self.check_packages(packages)
+        return self.results[key]
+
     def check_group(self, group_name: str) -> Tuple[bool, List[str], List[str]]:
         """检查预定义的包组"""
         if group_name not in self.PACKAGE_GROUPS:
             raise ValueError(f"未知的包组: {group_name}")
 
-        packages = self.PACKAGE_GROUPS[group_name]
-        return self.check_packages(packages)
+        return self._check_cached(group_name, self.PACKAGE_GROUPS[group_name])
 
     def check_mode_dependencies(self, mode: str) -> Tuple[bool, List[str], List[str]]:
         """根据模式检查依赖"""
         if mode == 'cluster_monitor':
             return self.check_group('cluster_monitor')
         elif mode == 'production':
-            # 检查基础包 + 生产包
-            base_success, base_missing, base_installed = self.check_group('base')
-
-            # 检查WSGI服务器（根据系统选择）
-            import platform
-            is_windows = platform.system().lower() == 'windows'
-
-            if is_windows:
-                wsgi_success, wsgi_missing, wsgi_installed = self.check_packages([('waitress', 'waitress')])
-            else:
-                wsgi_success, wsgi_missing, wsgi_installed = self.check_packages([('gunicorn', 'gunicorn')])
-
-            all_missing = base_missing + wsgi_missing
-            all_installed = base_installed + wsgi_installed
-
-            return len(all_missing) == 0, all_missing, all_installed
+            return self._check_cached('production_mode', self.PRODUCTION_PACKAGES)
         else:
             # 默认检查基础包
             return self.check_group('base')
 
     def install_packages(self, packages: List[str], requirements_file: str = None) -> bool:
-        """安装依赖包"""
+        """安装依赖包（一次pip调用装完全部包，输出直接显示在终端）"""
+        pip_cmd = [sys.executable, "-m", "pip", "install", "--disable-pip-version-check", "--no-input"]
         try:
             if requirements_file and packages == ['requirements']:
                 # 从requirements文件安装
                 print(f"📦 从 {requirements_file} 安装依赖...")
-                result = subprocess.run([
-                    sys.executable, "-m", "pip", "install", "-r", requirements_file
-                ], capture_output=True, text=True)
+                returncode = subprocess.call(pip_cmd + ["-r", requirements_file])
             else:
                 # 安装指定包
                 print(f"📦 安装依赖包: {', '.join(packages)}")
-                result = subprocess.run([
-                    sys.executable, "-m", "pip", "install"
-                ] + packages, capture_output=True, text=True)
+                returncode = subprocess.call(pip_cmd + list(dict.fromkeys(packages)))
 
-            if result.returncode == 0:
+            if returncode == 0:
+                # 安装后清空缓存，之后的检查需要重新探测
+                importlib.invalidate_caches()
+                self._probe_cache.clear()
+                self.results.clear()
                 print("✅ 依赖安装成功")
                 return True
             else:
-                print(f"❌ 依赖安装失败: {result.stderr}")
+                print(f"❌ 依赖安装失败 (pip 退出码: {returncode})")
                 return False
 
         except Exception as e:
@@ -140,10 +152,20 @@ class DependencyManager:
             return False
 
     def check_redis_service(self) -> bool:
-        """检查Redis服务是否可用"""
+        """检查Redis服务是否可用（先探测端口，端口在监听时才导入redis）"""
+        host = os.environ.get('REDIS_HOST', 'localhost')
+        port = int(os.environ.get('REDIS_PORT', '6379'))
+
+        try:
+            socket.create_connection((host, port), timeout=0.2).close()
+        except OSError:
+            print(f"⚠️ Redis端口未监听: {host}:{port}")
+            print("💡 系统将降级到SQLite模式")
+            return False
+
         try:
             import redis
-            client = redis.Redis(host='localhost', port=6379, db=1, socket_timeout=3)
+            client = redis.Redis(host=host, port=port, db=1, socket_timeout=3)
             client.ping()
             print("✅ Redis服务可用")
             return True
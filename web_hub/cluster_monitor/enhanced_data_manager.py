@@ -15,11 +15,21 @@ import os
 import json
 import sqlite3
 import threading
+import time
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, asdict
 import logging
 
+try:
+    import orjson  # 可选：C实现的JSON序列化/解析，比标准库 json 快数倍
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
 # Redis支持检测
 try:
     import redis
@@ -28,6 +38,79 @@ except ImportError:
     REDIS_AVAILABLE = False
     print("⚠️ Redis不可用，将使用纯SQLite模式")
 
+# 按 (host, port, db) 共享的Redis连接池，同一进程内的多个管理器实例复用连接
+_REDIS_POOLS: Dict[tuple, Any] = {}
+_REDIS_POOLS_LOCK = threading.Lock()
+
+
+def _get_redis_pool(host: str, port: int, db: int, **kwargs):
+    """获取（或创建）共享的阻塞式Redis连接池：连接数有上限，取不到连接时最多等待 timeout 秒"""
+    key = (host, port, db)
+    with _REDIS_POOLS_LOCK:
+        pool = _REDIS_POOLS.get(key)
+        if pool is None:
+            pool = redis.BlockingConnectionPool(host=host, port=port, db=db, **kwargs)
+            _REDIS_POOLS[key] = pool
+        return pool
+
+
+def _decode(value):
+    """Redis以bytes返回（未开启decode_responses），状态等文本字段按需解码"""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+# forum_posts 中由监控节点读写的列（顺序与 ForumPostRecord 字段一致）
+_POST_COLUMNS = (
+    'post_id', 'thread_id', 'title', 'author_name', 'source_url',
+    'discovered_time', 'processing_status', 'dispatch_time',
+    'completion_time', 'task_id', 'machine_url', 'error_message',
+    'retry_count', 'has_video', 'has_audio', 'content_length',
+    'tags', 'created_at', 'last_updated'
+)
+
+# 列固定，INSERT 语句只构建一次，SQLite 语句缓存每次都能命中
+_INSERT_POST_SQL = (
+    f"INSERT OR REPLACE INTO forum_posts ({', '.join(_POST_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_POST_COLUMNS))})"
+)
+
+# 按固定列顺序查询，结果行可直接按位置构造 ForumPostRecord
+_SELECT_POST_SQL = f"SELECT {', '.join(_POST_COLUMNS)} FROM forum_posts"
+_POST_COLUMN_SET = frozenset(_POST_COLUMNS)
+_DATETIME_FIELDS = ('discovered_time', 'dispatch_time', 'completion_time', 'created_at', 'last_updated')
+_DATETIME_COLUMN_INDEXES = tuple(_POST_COLUMNS.index(column) for column in _DATETIME_FIELDS)
+_TAGS_COLUMN_INDEX = _POST_COLUMNS.index('tags')
+
+
+def _serialize_post(post: 'ForumPostRecord'):
+    """序列化Redis缓存载荷：按列顺序的JSON数组（不带字段名，体积更小，读取时按位置构造）"""
+    values = post.to_values()
+    if orjson is not None:
+        return orjson.dumps(values)
+    return json.dumps(values, ensure_ascii=False)
+
+
+# 三种常用状态更新的固定语句（参数顺序：last_updated, 各附加列..., post_id）
+_MARK_DISPATCHED_SQL = (
+    "UPDATE forum_posts SET processing_status = 'dispatched', last_updated = ?, "
+    "machine_url = ?, dispatch_time = ? WHERE post_id = ?"
+)
+_MARK_COMPLETED_SQL = (
+    "UPDATE forum_posts SET processing_status = 'completed', last_updated = ?, "
+    "completion_time = ? WHERE post_id = ?"
+)
+_MARK_FAILED_SQL = (
+    "UPDATE forum_posts SET processing_status = 'failed', last_updated = ?, "
+    "error_message = ?, retry_count = COALESCE(retry_count, 0) + 1 WHERE post_id = ?"
+)
+
+
+@lru_cache(maxsize=32)
+def _update_status_sql(extra_columns: tuple) -> str:
+    """按附加更新列生成 UPDATE 语句（同一组列只构建一次）"""
+    assignments = ', '.join(f"{column} = ?" for column in ('processing_status', 'last_updated') + extra_columns)
+    return f"UPDATE forum_posts SET {assignments} WHERE post_id = ?"
+
 
 @dataclass
 class ForumPostRecord:
@@ -64,41 +147,95 @@ class ForumPostRecord:
             data['tags'] = []
         return data
 
+    def to_values(self) -> tuple:
+        """按 forum_posts 列顺序输出字段值（datetime 转 ISO 字符串，tags 转 JSON 字符串）"""
+        def iso(value):
+            return value.isoformat() if isinstance(value, datetime) else value
+
+        return (
+            self.post_id, self.thread_id, self.title, self.author_name, self.source_url,
+            iso(self.discovered_time), self.processing_status, iso(self.dispatch_time),
+            iso(self.completion_time), self.task_id, self.machine_url, self.error_message,
+            self.retry_count, self.has_video, self.has_audio, self.content_length,
+            json.dumps(self.tags or [], ensure_ascii=False), iso(self.created_at),
+            iso(self.last_updated)
+        )
+
+    def to_row(self) -> tuple:
+        """生成 INSERT 绑定参数（同 to_values，last_updated 取当前时间）"""
+        return self.to_values()[:-1] + (datetime.now().isoformat(),)
+
+    @classmethod
+    def from_row(cls, row: tuple) -> 'ForumPostRecord':
+        """从按 _POST_COLUMNS 顺序查询出的行创建对象（按位置构造，不经过中间字典）"""
+        values = list(row)
+        for index in _DATETIME_COLUMN_INDEXES:
+            if values[index]:
+                values[index] = datetime.fromisoformat(values[index])
+        # 绝大多数帖子没有标签（存为 '[]'），这种情况不必调用 JSON 解析
+        tags = values[_TAGS_COLUMN_INDEX]
+        values[_TAGS_COLUMN_INDEX] = _json_loads(tags) if tags and tags != '[]' else []
+        return cls(*values)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ForumPostRecord':
         """从字典创建对象"""
-        # 处理datetime字段
-        datetime_fields = ['discovered_time', 'dispatch_time', 'completion_time', 'created_at', 'last_updated']
-        for field in datetime_fields:
-            if data.get(field):
-                data[field] = datetime.fromisoformat(data[field])
+        # 处理datetime字段（已经是datetime的不再解析）
+        for field in _DATETIME_FIELDS:
+            value = data.get(field)
+            if value and isinstance(value, str):
+                data[field] = datetime.fromisoformat(value)
 
         # 处理tags字段
         if data.get('tags') is None:
             data['tags'] = []
 
-        # 过滤掉不存在的字段，避免意外的关键字参数错误
-        valid_fields = {
-            'post_id', 'thread_id', 'title', 'author_name', 'source_url',
-            'discovered_time', 'processing_status', 'dispatch_time',
-            'completion_time', 'task_id', 'machine_url', 'error_message',
-            'retry_count', 'has_video', 'has_audio', 'content_length',
-            'tags', 'created_at', 'last_updated'
-        }
-
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
-
-        return cls(**filtered_data)
+        # 过滤掉不存在的字段，避免意外的关键字参数错误（本模块写入的缓存载荷字段完全一致，直接使用）
+        if data.keys() <= _POST_COLUMN_SET:
+            return cls(**data)
+        return cls(**{k: v for k, v in data.items() if k in _POST_COLUMN_SET})
 
 
 class SQLiteRedisDataManager:
     """SQLite + Redis 双层存储数据管理器"""
 
+    # 每个连接打开时设置的性能参数（WAL + 内存临时表 + mmap + 忙等待）
+    _SQLITE_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA busy_timeout=5000",
+    )
+
+    # 数据库结构版本（记录在 PRAGMA user_version），已是该版本时跳过建表和迁移
+    _SCHEMA_VERSION = 2
+
+    # 进程内一级缓存：帖子记录（LRU + TTL）和已确认处理过的帖子ID（LRU）
+    _L1_MAXSIZE = 4096
+    _L1_TTL = 60  # 秒
+    _PROCESSED_IDS_MAXSIZE = 16384
+    _PROCESSED_STATUSES = ('dispatched', 'completed')
+
+    # 延迟写入：攒够这么多条或等待这么久（秒）就批量落盘
+    _WRITE_BATCH_SIZE = 500
+    _WRITE_INTERVAL = 0.1
+    # SQLite暂时不可写（如被锁）时最多保留这么多待写帖子，超出部分丢弃并记录到死信
+    _MAX_PENDING_WRITES = 10000
+    _DEAD_LETTER_MAXSIZE = 1000
+    # 表结构中 NOT NULL 的列，入队前检查，避免必然失败的记录进入延迟写入队列
+    _REQUIRED_FIELDS = ('post_id', 'thread_id', 'title', 'author_name', 'source_url', 'discovered_time')
+
     def __init__(self, db_path: str = "data/forum_posts.db",
-                 redis_host: str = "localhost", redis_port: int = 6379, redis_db: int = 1):
+                 redis_host: str = "localhost", redis_port: int = 6379, redis_db: int = 1,
+                 write_behind: bool = True):
         self.db_path = db_path
         self.redis_client = None
         self._lock = threading.RLock()
+        # 每个线程一条长连接，避免每次操作都重新打开数据库文件
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
         self.logger = logging.getLogger(__name__)
 
         # Redis配置
@@ -106,9 +243,11 @@ class SQLiteRedisDataManager:
             'host': redis_host,
             'port': redis_port,
             'db': redis_db,
-            'decode_responses': True,
+            # 不开启decode_responses：帖子载荷直接以bytes交给JSON解析，省去一次解码
             'socket_timeout': 5,
-            'socket_connect_timeout': 5
+            'socket_connect_timeout': 5,
+            'max_connections': 32,
+            'timeout': 5
         }
 
         # 确保数据目录存在
@@ -124,13 +263,50 @@ class SQLiteRedisDataManager:
         self._stats_cache = {}
         self._stats_cache_time = None
 
+        # 一级缓存（由 self._lock 保护）
+        self._post_cache: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._processed_ids: 'OrderedDict[str, None]' = OrderedDict()
+        # 正在回源加载的帖子ID -> 锁（防止缓存击穿时多个线程同时查库）
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+        # 延迟写入（write-behind）：Redis可用时 save_post 先写Redis，SQLite由后台线程批量落盘。
+        # 待写帖子一定已在Redis缓存和状态哈希中，按post_id的读取不受影响；
+        # 依赖SQLite完整数据的操作（UPDATE、列表、统计）执行前会先调用 _flush_writes()
+        self._pending_writes: List[ForumPostRecord] = []
+        # 无法写入SQLite而被丢弃的帖子（最近的若干条），便于排查
+        self.dead_letters: 'deque[ForumPostRecord]' = deque(maxlen=self._DEAD_LETTER_MAXSIZE)
+        self._writer_stop = threading.Event()
+        self._writer_thread = None
+        if write_behind and self.redis_client:
+            self._writer_thread = threading.Thread(
+                target=self._write_behind_loop, name="forum-posts-writer", daemon=True
+            )
+            self._writer_thread.start()
+
         print(f"📊 SQLite + Redis 数据管理器已初始化")
         print(f"   SQLite: {self.db_path}")
         print(f"   Redis: {'✅ 可用' if self.redis_client else '❌ 不可用，使用SQLite模式'}")
         
+    def _connect(self) -> sqlite3.Connection:
+        """获取当前线程的SQLite长连接（首次使用时打开并设置性能参数）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # check_same_thread=False 仅用于 close() 时跨线程关闭，正常使用时连接不跨线程
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+            for pragma in self._SQLITE_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
     def _init_database(self):
         """初始化SQLite数据库 - 使用统一的SQL脚本"""
         try:
+            if self._connect().execute("PRAGMA user_version").fetchone()[0] >= self._SCHEMA_VERSION:
+                self.logger.info("SQLite数据库结构已是最新，跳过初始化")
+                return
+
             # 尝试使用统一的 forum_posts.sql 脚本（与工作节点相同）
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             candidate_paths = [
@@ -147,15 +323,16 @@ class SQLiteRedisDataManager:
                 with open(sql_script_path, 'r', encoding='utf-8') as f:
                     sql_script = f.read()
 
-                with sqlite3.connect(self.db_path) as conn:
-                    conn.executescript(sql_script)
-                    conn.commit()
+                conn = self._connect()
+                conn.executescript(sql_script)
+                conn.commit()
 
                 self.logger.info("SQLite数据库初始化成功（使用统一脚本）")
             else:
                 # 降级方案：手动创建表（与forum_posts.sql保持一致）
                 self.logger.warning("未找到forum_posts.sql，使用内置表结构")
-                with sqlite3.connect(self.db_path) as conn:
+                conn = self._connect()
+                with conn:
                     conn.execute("""
                     CREATE TABLE IF NOT EXISTS forum_posts (
                         post_id TEXT PRIMARY KEY,
@@ -179,10 +356,10 @@ class SQLiteRedisDataManager:
                         last_updated TEXT DEFAULT CURRENT_TIMESTAMP
                     )
                     """)
-                    conn.commit()
 
             # 兼容性检查：如果是旧数据库，添加缺失的监控字段
-            with sqlite3.connect(self.db_path) as conn:
+            conn = self._connect()
+            with conn:
                 cursor = conn.execute("PRAGMA table_info(forum_posts)")
                 existing_columns = {row[1] for row in cursor.fetchall()}
 
@@ -209,17 +386,25 @@ class SQLiteRedisDataManager:
                         except Exception as e:
                             self.logger.warning(f"添加字段 {field_name} 失败（可能已存在）: {e}")
 
-                conn.commit()
-
                 # 创建索引
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_status ON forum_posts(processing_status)")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_discovered_time ON forum_posts(discovered_time)")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_author ON forum_posts(author_name)")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_machine ON forum_posts(machine_url)")
                 conn.execute("CREATE INDEX IF NOT EXISTS idx_retry ON forum_posts(retry_count)")
+                # 按状态分页查询（WHERE processing_status = ? ORDER BY discovered_time DESC）免排序
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_status_time ON forum_posts(processing_status, discovered_time DESC)"
+                )
+                # 今日统计 WHERE DATE(discovered_time) = ? 使用表达式索引，避免全表扫描
+                try:
+                    conn.execute("CREATE INDEX IF NOT EXISTS idx_discovered_date ON forum_posts(DATE(discovered_time))")
+                except sqlite3.OperationalError as e:
+                    self.logger.warning(f"创建表达式索引失败（SQLite版本过旧）: {e}")
 
-                conn.commit()
-                self.logger.info("SQLite数据库初始化成功")
+                conn.execute(f"PRAGMA user_version = {self._SCHEMA_VERSION}")
+
+            self.logger.info("SQLite数据库初始化成功")
 
         except Exception as e:
             self.logger.error(f"SQLite数据库初始化失败: {e}")
@@ -232,7 +417,7 @@ class SQLiteRedisDataManager:
             return
 
         try:
-            self.redis_client = redis.Redis(**self.redis_config)
+            self.redis_client = redis.Redis(connection_pool=_get_redis_pool(**self.redis_config))
             self.redis_client.ping()
             self.logger.info("Redis连接成功")
 
@@ -247,13 +432,26 @@ class SQLiteRedisDataManager:
         """保存帖子记录"""
         try:
             with self._lock:
+                if self._writer_thread:
+                    missing = [field for field in self._REQUIRED_FIELDS if getattr(post, field) is None]
+                    if missing:
+                        self.logger.error(f"帖子 {post.post_id} 缺少必填字段 {missing}，不予保存")
+                        return False
+
+                    # 延迟写入：先入队，再更新Redis；Redis更新失败时立即落盘，保证数据可查
+                    self._pending_writes.append(post)
+                    self._refresh_local(post.post_id, post.processing_status)
+                    if not self._update_redis_for_posts([post]) or len(self._pending_writes) >= self._WRITE_BATCH_SIZE:
+                        self._flush_writes()
+                    self._clear_stats_cache()
+                    return True
+
                 # 保存到SQLite（主存储）
                 success = self._save_to_sqlite(post)
                 if success:
-                    # 更新Redis缓存
-                    self._update_redis_cache(post)
-                    # 更新Redis状态集合
-                    self._update_redis_status_sets(post)
+                    self._refresh_local(post.post_id, post.processing_status)
+                    # 更新Redis缓存和状态哈希
+                    self._update_redis_for_posts([post])
                     # 清除统计缓存
                     self._clear_stats_cache()
 
@@ -262,35 +460,105 @@ class SQLiteRedisDataManager:
             self.logger.error(f"保存帖子记录失败: {e}")
             return False
     
-    def _save_to_sqlite(self, post: ForumPostRecord) -> bool:
-        """保存到SQLite"""
+    def save_posts_bulk(self, posts: List[ForumPostRecord]) -> bool:
+        """批量保存帖子记录（一个事务内 executemany，只提交一次）"""
+        if not posts:
+            return True
         try:
-            data = post.to_dict()
-            data['tags'] = json.dumps(data['tags'], ensure_ascii=False)
-            data['last_updated'] = datetime.now().isoformat()
-
-            # 移除不存在的字段（统一使用 source_url）
-            valid_columns = [
-                'post_id', 'thread_id', 'title', 'author_name', 'source_url',
-                'discovered_time', 'processing_status', 'dispatch_time',
-                'completion_time', 'task_id', 'machine_url', 'error_message',
-                'retry_count', 'has_video', 'has_audio', 'content_length',
-                'tags', 'created_at', 'last_updated'
-            ]
+            with self._lock:
+                self._flush_writes()
+                conn = self._connect()
+                with conn:
+                    conn.executemany(_INSERT_POST_SQL, [post.to_row() for post in posts])
 
-            filtered_data = {k: v for k, v in data.items() if k in valid_columns}
-            columns = list(filtered_data.keys())
-            placeholders = ['?' for _ in columns]
-            values = list(filtered_data.values())
+                for post in posts:
+                    self._refresh_local(post.post_id, post.processing_status)
 
-            sql = f"""
-            INSERT OR REPLACE INTO forum_posts ({', '.join(columns)})
-            VALUES ({', '.join(placeholders)})
-            """
+                self._update_redis_for_posts(posts)
+                self._clear_stats_cache()
+                return True
+        except Exception as e:
+            self.logger.error(f"批量保存帖子记录失败: {e}")
+            return False
 
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(sql, values)
-                conn.commit()
+    def _flush_writes(self):
+        """把待写队列中的帖子在一个事务内批量写入SQLite"""
+        with self._lock:
+            if not self._pending_writes:
+                return
+            batch, self._pending_writes = self._pending_writes, []
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(_INSERT_POST_SQL, [post.to_row() for post in batch])
+            except sqlite3.OperationalError as e:
+                # 数据库被锁等暂时性错误：放回队首，下次刷新时重试（队列长度有上限）
+                self._pending_writes[:0] = batch
+                overflow = len(self._pending_writes) - self._MAX_PENDING_WRITES
+                if overflow > 0:
+                    dropped = self._pending_writes[:overflow]
+                    del self._pending_writes[:overflow]
+                    self._drop_pending(dropped, f"待写队列超过 {self._MAX_PENDING_WRITES} 条")
+                self.logger.error(f"批量写入SQLite失败（{len(batch)} 条，稍后重试）: {e}")
+            except Exception as e:
+                # 约束冲突或数据错误：逐条写入，只丢弃本身写不进去的记录，不影响同批其他帖子
+                self.logger.error(f"批量写入SQLite失败（{len(batch)} 条），改为逐条写入: {e}")
+                self._write_rows_individually(batch)
+
+    def _write_rows_individually(self, batch: List[ForumPostRecord]):
+        """逐条写入一批帖子，写入失败的记录丢弃并记录到死信"""
+        failed = []
+        try:
+            conn = self._connect()
+            with conn:
+                for post in batch:
+                    try:
+                        conn.execute(_INSERT_POST_SQL, post.to_row())
+                    except sqlite3.OperationalError:
+                        raise
+                    except Exception as e:
+                        self.logger.error(f"帖子 {post.post_id} 写入SQLite失败，已丢弃: {e}")
+                        failed.append(post)
+        except sqlite3.OperationalError as e:
+            # 逐条写入过程中遇到暂时性错误：事务已回滚，可写的记录放回队首稍后重试
+            failed_ids = {id(post) for post in failed}
+            self._pending_writes[:0] = [post for post in batch if id(post) not in failed_ids]
+            self.logger.error(f"逐条写入SQLite失败（稍后重试）: {e}")
+        if failed:
+            self._drop_pending(failed, "数据无法写入SQLite")
+
+    def _drop_pending(self, posts: List[ForumPostRecord], reason: str):
+        """丢弃未能落盘的帖子：记入死信，并撤销其在本地缓存和Redis中的记录"""
+        self.logger.error(f"丢弃 {len(posts)} 条待写帖子（{reason}）")
+        self.dead_letters.extend(posts)
+        for post in posts:
+            self._post_cache.pop(post.post_id, None)
+            self._processed_ids.pop(post.post_id, None)
+        if not self.redis_client:
+            return
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for post in posts:
+                pipe.delete(f"{self.redis_prefix}post:{post.post_id}")
+                pipe.hdel(f"{self.redis_prefix}post_status", post.post_id)
+            # 计数中已包含这些帖子，删除初始化标记，下次更新时从SQLite重建
+            pipe.delete(f"{self.redis_prefix}stats:seeded")
+            pipe.execute()
+        except Exception as e:
+            self.logger.warning(f"撤销丢弃帖子的Redis记录失败: {e}")
+        self._clear_stats_cache()
+
+    def _write_behind_loop(self):
+        """后台写入线程：定期把待写帖子批量落盘"""
+        while not self._writer_stop.wait(self._WRITE_INTERVAL):
+            self._flush_writes()
+
+    def _save_to_sqlite(self, post: ForumPostRecord) -> bool:
+        """保存到SQLite"""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(_INSERT_POST_SQL, post.to_row())
 
             return True
         except Exception as e:
@@ -304,7 +572,7 @@ class SQLiteRedisDataManager:
                 return
 
             cache_key = f"{self.redis_prefix}post:{post.post_id}"
-            post_json = json.dumps(post.to_dict(), ensure_ascii=False)
+            post_json = _serialize_post(post)
 
             # 设置缓存，过期时间24小时
             self.redis_client.setex(cache_key, 86400, post_json)
@@ -312,44 +580,118 @@ class SQLiteRedisDataManager:
         except Exception as e:
             self.logger.warning(f"Redis缓存更新失败: {e}")
 
-    def _update_redis_status_sets(self, post: ForumPostRecord):
-        """更新Redis状态集合"""
+    def _update_redis_for_posts(self, posts: List[ForumPostRecord]) -> bool:
+        """更新Redis缓存、状态哈希和状态计数（所有帖子的写命令合并到一个pipeline），返回是否成功"""
         try:
             if not self.redis_client:
-                return
+                return False
 
-            # 从所有状态集合中移除
-            for status in ['discovered', 'dispatched', 'completed', 'failed']:
-                status_key = f"{self.redis_prefix}status:{status}"
-                self.redis_client.srem(status_key, post.post_id)
+            status_key = f"{self.redis_prefix}post_status"
+            counts_key = f"{self.redis_prefix}stats:status_counts"
+
+            # 一次往返取回计数是否已初始化和各帖子的旧状态
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.exists(f"{self.redis_prefix}stats:seeded")
+            pipe.hmget(status_key, [post.post_id for post in posts])
+            seeded, previous = pipe.execute()
+
+            if not seeded:
+                # 计数未初始化（首次启动或Redis被清空）：从SQLite全量重建，本批帖子已包含在内
+                self._seed_redis_stats()
+
+            previous_status = dict(zip((post.post_id for post in posts), map(_decode, previous)))
+            pipe = self.redis_client.pipeline(transaction=False)
+            for post in posts:
+                # 缓存帖子数据，过期时间24小时
+                cache_key = f"{self.redis_prefix}post:{post.post_id}"
+                pipe.setex(cache_key, 86400, _serialize_post(post))
+
+                # 状态哈希 post_id -> 当前状态，一条HSET即可覆盖旧状态
+                pipe.hset(status_key, post.post_id, post.processing_status)
+
+                # 状态变化时增量调整计数
+                old_status = previous_status[post.post_id]
+                if seeded and old_status != post.processing_status:
+                    if old_status is not None:
+                        pipe.hincrby(counts_key, old_status, -1)
+                    else:
+                        # 新帖子：按发现日期累加每日计数，保留8天
+                        day_key = self._day_key(post.discovered_time)
+                        pipe.incr(day_key)
+                        pipe.expire(day_key, 86400 * 8)
+                    pipe.hincrby(counts_key, post.processing_status, 1)
+                previous_status[post.post_id] = post.processing_status
+            pipe.execute()
+            return True
 
-            # 添加到当前状态集合
-            current_status_key = f"{self.redis_prefix}status:{post.processing_status}"
-            self.redis_client.sadd(current_status_key, post.post_id)
+        except Exception as e:
+            self.logger.warning(f"Redis缓存/状态更新失败: {e}")
+            return False
 
-            # 设置过期时间（7天）
-            self.redis_client.expire(current_status_key, 604800)
+    def _seed_redis_stats(self):
+        """从SQLite重建Redis中的状态哈希和状态计数"""
+        self._flush_writes()
+        rows = self._connect().execute(
+            "SELECT post_id, processing_status FROM forum_posts WHERE processing_status IS NOT NULL"
+        ).fetchall()
+
+        status_counts: Dict[str, int] = {}
+        for _, status in rows:
+            status_counts[status] = status_counts.get(status, 0) + 1
+
+        today = datetime.now()
+        today_posts = self._connect().execute(
+            "SELECT COUNT(*) FROM forum_posts WHERE DATE(discovered_time) = ?",
+            (today.date().isoformat(),)
+        ).fetchone()[0]
+
+        status_key = f"{self.redis_prefix}post_status"
+        counts_key = f"{self.redis_prefix}stats:status_counts"
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.delete(counts_key)
+        if status_counts:
+            pipe.hset(counts_key, mapping=status_counts)
+        for start in range(0, len(rows), 1000):
+            pipe.hset(status_key, mapping=dict(rows[start:start + 1000]))
+        pipe.setex(self._day_key(today), 86400 * 8, today_posts)
+        pipe.set(f"{self.redis_prefix}stats:seeded", 1)
+        pipe.execute()
+        self.logger.info(f"Redis状态计数已从SQLite重建: {len(rows)} 条帖子")
 
-        except Exception as e:
-            self.logger.warning(f"Redis状态集合更新失败: {e}")
-    
     def get_post(self, post_id: str) -> Optional[ForumPostRecord]:
         """获取帖子记录"""
         try:
-            # 先尝试从Redis获取
-            if self.redis_client:
-                cached_data = self._get_from_redis(post_id)
-                if cached_data:
-                    return cached_data
-
-            # 从SQLite获取
-            post = self._get_from_sqlite(post_id)
+            # 先查进程内缓存
+            post = self._lookup_local(post_id)
+            if post:
+                return post
 
-            # 如果从SQLite获取成功，更新Redis缓存
-            if post and self.redis_client:
-                self._update_redis_cache(post)
-
-            return post
+            # 同一帖子只让一个线程回源加载，其余线程等待后直接命中进程内缓存
+            with self._lock:
+                load_lock = self._load_locks.setdefault(post_id, threading.Lock())
+            with load_lock:
+                try:
+                    post = self._lookup_local(post_id)
+                    if post:
+                        return post
+
+                    # 再尝试从Redis获取
+                    post = self._get_from_redis(post_id) if self.redis_client else None
+
+                    if post is None:
+                        # 从SQLite获取
+                        post = self._get_from_sqlite(post_id)
+
+                        # 如果从SQLite获取成功，更新Redis缓存
+                        if post and self.redis_client:
+                            self._update_redis_cache(post)
+
+                    if post:
+                        self._cache_local(post)
+                    return post
+                finally:
+                    with self._lock:
+                        self._load_locks.pop(post_id, None)
 
         except Exception as e:
             self.logger.error(f"获取帖子记录失败: {e}")
@@ -361,7 +703,10 @@ class SQLiteRedisDataManager:
             cache_key = f"{self.redis_prefix}post:{post_id}"
             cached_json = self.redis_client.get(cache_key)
             if cached_json:
-                post_data = json.loads(cached_json)
+                post_data = _json_loads(cached_json)
+                # 数组为当前格式；旧版本写入的字典载荷在过期前仍可读取
+                if isinstance(post_data, list):
+                    return ForumPostRecord.from_row(post_data)
                 return ForumPostRecord.from_dict(post_data)
         except Exception as e:
             self.logger.warning(f"Redis读取失败: {e}")
@@ -370,20 +715,9 @@ class SQLiteRedisDataManager:
     def _get_from_sqlite(self, post_id: str) -> Optional[ForumPostRecord]:
         """从SQLite获取"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute("SELECT * FROM forum_posts WHERE post_id = ?", (post_id,))
-                row = cursor.fetchone()
-
-                if row:
-                    data = dict(row)
-                    # 处理tags字段
-                    if data['tags']:
-                        data['tags'] = json.loads(data['tags'])
-                    else:
-                        data['tags'] = []
-
-                    return ForumPostRecord.from_dict(data)
+            row = self._connect().execute(f"{_SELECT_POST_SQL} WHERE post_id = ?", (post_id,)).fetchone()
+            if row:
+                return ForumPostRecord.from_row(row)
         except Exception as e:
             self.logger.error(f"SQLite读取失败: {e}")
         return None
@@ -391,20 +725,27 @@ class SQLiteRedisDataManager:
     def is_post_processed(self, post_id: str) -> bool:
         """检查帖子是否已被处理"""
         try:
-            # 先检查Redis状态集合（快速查询）
+            # 已确认处理过的帖子直接返回
+            if post_id in self._processed_ids:
+                return True
+
+            # 先检查Redis状态哈希（一次HGET）
+            processed = False
             if self.redis_client:
-                for status in ['dispatched', 'completed']:
-                    status_key = f"{self.redis_prefix}status:{status}"
-                    if self.redis_client.sismember(status_key, post_id):
-                        return True
-
-            # 从SQLite检查
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
+                status = self.redis_client.hget(f"{self.redis_prefix}post_status", post_id)
+                processed = _decode(status) in self._PROCESSED_STATUSES
+
+            if not processed:
+                # 从SQLite检查
+                cursor = self._connect().execute(
                     "SELECT 1 FROM forum_posts WHERE post_id = ? AND processing_status IN ('dispatched', 'completed')",
                     (post_id,)
                 )
-                return cursor.fetchone() is not None
+                processed = cursor.fetchone() is not None
+
+            if processed:
+                self._remember_processed(post_id)
+            return processed
 
         except Exception as e:
             self.logger.error(f"检查帖子处理状态失败: {e}")
@@ -434,96 +775,72 @@ class SQLiteRedisDataManager:
     
     def mark_post_dispatched(self, post_id: str, machine_url: str) -> bool:
         """标记帖子已分发"""
-        return self.update_post_status(
-            post_id,
-            'dispatched',
-            machine_url=machine_url,
-            dispatch_time=datetime.now()
+        now = datetime.now().isoformat()
+        return self._execute_status_update(
+            post_id, 'dispatched', _MARK_DISPATCHED_SQL, (now, machine_url, now, post_id)
         )
 
     def mark_post_completed(self, post_id: str) -> bool:
         """标记帖子完成"""
-        return self.update_post_status(
-            post_id,
-            'completed',
-            completion_time=datetime.now()
+        now = datetime.now().isoformat()
+        return self._execute_status_update(
+            post_id, 'completed', _MARK_COMPLETED_SQL, (now, now, post_id)
         )
 
     def mark_post_failed(self, post_id: str, error_message: str) -> bool:
-        """标记帖子失败"""
-        post = self.get_post(post_id)
-        retry_count = post.retry_count + 1 if post else 1
-
-        return self.update_post_status(
-            post_id,
-            'failed',
-            error_message=error_message,
-            retry_count=retry_count
+        """标记帖子失败（重试次数在SQL中原子加一）"""
+        return self._execute_status_update(
+            post_id, 'failed', _MARK_FAILED_SQL,
+            (datetime.now().isoformat(), error_message, post_id)
         )
 
     def get_posts_by_status(self, status: str, limit: int = 100) -> List[ForumPostRecord]:
         """按状态获取帖子列表"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(
-                    """SELECT * FROM forum_posts
-                       WHERE processing_status = ?
-                       ORDER BY discovered_time DESC
-                       LIMIT ?""",
-                    (status, limit)
-                )
-
-                posts = []
-                for row in cursor.fetchall():
-                    data = dict(row)
-                    if data['tags']:
-                        data['tags'] = json.loads(data['tags'])
-                    else:
-                        data['tags'] = []
-                    posts.append(ForumPostRecord.from_dict(data))
-
-                return posts
+            self._flush_writes()
+            cursor = self._connect().execute(
+                f"""{_SELECT_POST_SQL}
+                   WHERE processing_status = ?
+                   ORDER BY discovered_time DESC
+                   LIMIT ?""",
+                (status, limit)
+            )
+            return [ForumPostRecord.from_row(row) for row in cursor]
         except Exception as e:
             self.logger.error(f"按状态查询帖子失败: {e}")
             return []
     
     def update_post_status(self, post_id: str, status: str, **kwargs) -> bool:
         """更新帖子状态"""
+        values = [status, datetime.now().isoformat()]
+
+        # 添加其他字段
+        for key, value in kwargs.items():
+            if key in ['dispatch_time', 'completion_time'] and isinstance(value, datetime):
+                value = value.isoformat()
+            values.append(value)
+
+        values.append(post_id)
+        return self._execute_status_update(post_id, status, _update_status_sql(tuple(kwargs)), values)
+
+    def _execute_status_update(self, post_id: str, status: str, sql: str, values) -> bool:
+        """执行状态更新语句，并同步进程内缓存、Redis和统计缓存"""
         try:
             with self._lock:
-                # 构建更新字段
-                update_fields = ["processing_status = ?", "last_updated = ?"]
-                values = [status, datetime.now().isoformat()]
-
-                # 添加其他字段
-                for key, value in kwargs.items():
-                    if key in ['dispatch_time', 'completion_time'] and isinstance(value, datetime):
-                        value = value.isoformat()
-                    update_fields.append(f"{key} = ?")
-                    values.append(value)
-
-                values.append(post_id)
-
-                sql = f"""
-                UPDATE forum_posts
-                SET {', '.join(update_fields)}
-                WHERE post_id = ?
-                """
-
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.execute(sql, values)
-                    success = cursor.rowcount > 0
-                    conn.commit()
+                # 待写的帖子必须先落盘，否则UPDATE会找不到记录
+                self._flush_writes()
+
+                conn = self._connect()
+                with conn:
+                    success = conn.execute(sql, values).rowcount > 0
 
                 if success:
+                    self._refresh_local(post_id, status)
                     # 获取更新后的帖子信息
                     updated_post = self._get_from_sqlite(post_id)
                     if updated_post:
-                        # 更新Redis缓存
-                        self._update_redis_cache(updated_post)
-                        # 更新Redis状态集合
-                        self._update_redis_status_sets(updated_post)
+                        # 更新Redis缓存和状态哈希
+                        self._update_redis_for_posts([updated_post])
 
                     # 清除统计缓存
                     self._clear_stats_cache()
@@ -541,8 +858,13 @@ class SQLiteRedisDataManager:
                 datetime.now() - self._stats_cache_time < timedelta(minutes=5)):
                 return self._stats_cache
 
-            with sqlite3.connect(self.db_path) as conn:
-                # 状态统计
+            self._flush_writes()
+            conn = self._connect()
+            # 状态统计和今日统计：优先读取Redis中增量维护的计数，未初始化时扫描SQLite
+            redis_counts = self._get_redis_counters()
+            if redis_counts is not None:
+                status_counts, today_posts = redis_counts
+            else:
                 cursor = conn.execute("""
                     SELECT processing_status, COUNT(*) as count
                     FROM forum_posts
@@ -550,11 +872,6 @@ class SQLiteRedisDataManager:
                 """)
                 status_counts = dict(cursor.fetchall())
 
-                # 总数统计
-                cursor = conn.execute("SELECT COUNT(*) FROM forum_posts")
-                total_posts = cursor.fetchone()[0]
-
-                # 今日统计
                 today = datetime.now().date().isoformat()
                 cursor = conn.execute("""
                     SELECT COUNT(*) FROM forum_posts
@@ -562,35 +879,94 @@ class SQLiteRedisDataManager:
                 """, (today,))
                 today_posts = cursor.fetchone()[0]
 
-                # 机器统计
-                cursor = conn.execute("""
-                    SELECT machine_url, COUNT(*) as count
-                    FROM forum_posts
-                    WHERE machine_url IS NOT NULL
-                    GROUP BY machine_url
-                """)
-                machine_stats = dict(cursor.fetchall())
-
-                stats = {
-                    'total_posts': total_posts,
-                    'today_posts': today_posts,
-                    'status_counts': status_counts,
-                    'machine_stats': machine_stats,
-                    'processed_posts': status_counts.get('dispatched', 0) + status_counts.get('completed', 0),
-                    'redis_available': self.redis_client is not None,
-                    'last_updated': datetime.now().isoformat()
-                }
-
-                # 缓存结果
-                self._stats_cache = stats
-                self._stats_cache_time = datetime.now()
-
-                return stats
+            # 总数统计
+            total_posts = sum(status_counts.values())
+
+            # 机器统计
+            cursor = conn.execute("""
+                SELECT machine_url, COUNT(*) as count
+                FROM forum_posts
+                WHERE machine_url IS NOT NULL
+                GROUP BY machine_url
+            """)
+            machine_stats = dict(cursor.fetchall())
+
+            stats = {
+                'total_posts': total_posts,
+                'today_posts': today_posts,
+                'status_counts': status_counts,
+                'machine_stats': machine_stats,
+                'processed_posts': status_counts.get('dispatched', 0) + status_counts.get('completed', 0),
+                'redis_available': self.redis_client is not None,
+                'last_updated': datetime.now().isoformat()
+            }
+
+            # 缓存结果
+            self._stats_cache = stats
+            self._stats_cache_time = datetime.now()
+
+            return stats
 
         except Exception as e:
             self.logger.error(f"获取统计信息失败: {e}")
             return {}
 
+    def _day_key(self, day: datetime) -> str:
+        """每日新帖计数的Redis键"""
+        return f"{self.redis_prefix}stats:day:{day.strftime('%Y%m%d')}"
+
+    def _get_redis_counters(self) -> Optional[tuple]:
+        """读取Redis中的状态计数和今日新帖数；Redis不可用或计数未初始化时返回None"""
+        if not self.redis_client:
+            return None
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.exists(f"{self.redis_prefix}stats:seeded")
+            pipe.hgetall(f"{self.redis_prefix}stats:status_counts")
+            pipe.get(self._day_key(datetime.now()))
+            seeded, counts, today_posts = pipe.execute()
+            if not seeded:
+                return None
+            status_counts = {_decode(status): int(count) for status, count in counts.items() if int(count) > 0}
+            return status_counts, int(today_posts or 0)
+        except Exception as e:
+            self.logger.warning(f"Redis状态计数读取失败: {e}")
+            return None
+
+    def _lookup_local(self, post_id: str) -> Optional[ForumPostRecord]:
+        """查询进程内帖子缓存（过期条目视为未命中）"""
+        with self._lock:
+            entry = self._post_cache.get(post_id)
+            if entry and entry[0] > time.monotonic():
+                self._post_cache.move_to_end(post_id)
+                return entry[1]
+        return None
+
+    def _cache_local(self, post: ForumPostRecord):
+        """写入进程内帖子缓存（超出容量时淘汰最久未使用的条目）"""
+        with self._lock:
+            self._post_cache[post.post_id] = (time.monotonic() + self._L1_TTL, post)
+            self._post_cache.move_to_end(post.post_id)
+            if len(self._post_cache) > self._L1_MAXSIZE:
+                self._post_cache.popitem(last=False)
+
+    def _remember_processed(self, post_id: str):
+        """记录已处理的帖子ID"""
+        with self._lock:
+            self._processed_ids[post_id] = None
+            self._processed_ids.move_to_end(post_id)
+            if len(self._processed_ids) > self._PROCESSED_IDS_MAXSIZE:
+                self._processed_ids.popitem(last=False)
+
+    def _refresh_local(self, post_id: str, status: str):
+        """帖子写入后同步进程内缓存：丢弃旧记录，按新状态更新已处理集合"""
+        with self._lock:
+            self._post_cache.pop(post_id, None)
+            if status in self._PROCESSED_STATUSES:
+                self._remember_processed(post_id)
+            else:
+                self._processed_ids.pop(post_id, None)
+
     def _clear_stats_cache(self):
         """清除统计缓存"""
         self._stats_cache = {}
@@ -599,6 +975,18 @@ class SQLiteRedisDataManager:
     def close(self):
         """关闭数据管理器"""
         try:
+            # 停止后台写入线程并把剩余数据落盘
+            if self._writer_thread:
+                self._writer_stop.set()
+                self._writer_thread.join(timeout=5)
+                self._writer_thread = None
+            self._flush_writes()
+
+            with self._lock:
+                for conn in self._connections:
+                    conn.close()
+                self._connections.clear()
+            self._local = threading.local()
             if self.redis_client:
                 self.redis_client.close()
             print("💾 SQLite + Redis 数据管理器已关闭")
@@ -9,21 +9,32 @@
 3. 运行: python forum_monitor.py --port 8000
 """
 
+import atexit
 import os
+import re
+import socket
 import sys
 import time
 import uuid
 import requests
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from requests.adapters import HTTPAdapter
 from flask import Flask, jsonify, request, render_template_string, render_template
 from datetime import datetime
 from typing import List, Dict, Optional
 import json
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+try:
+    import orjson  # 可选：C实现的JSON序列化，比标准库 json 快数倍
+except ImportError:
+    orjson = None
 
 from shared.forum_config import load_forum_settings
 from shared.task_model import TaskType
-from web_hub.lightweight.queue_manager import QueueManager
 
 # 添加当前目录到路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -45,22 +56,45 @@ if _ENABLE_MOCK:
         print("ℹ️ 模拟数据管理器不可用（开发功能），不影响生产")
         MOCK_DATA_AVAILABLE = False
 
-# 🎯 导入完整版论坛爬虫
-try:
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from aicut_forum_crawler import AicutForumCrawler
-    from shared.forum_crawler_manager import get_forum_crawler_manager
-    FORUM_CRAWLER_AVAILABLE = True
+
+def _import_forum_crawler_manager():
+    """🎯 按需导入完整版论坛爬虫（论坛监控关闭时不加载爬虫及其依赖），不可用时返回None"""
+    try:
+        from aicut_forum_crawler import AicutForumCrawler  # noqa: F401  检查爬虫依赖是否完整
+        from shared.forum_crawler_manager import get_forum_crawler_manager
+    except ImportError as e:
+        print(f"❌ 论坛爬虫导入失败: {e}")
+        return None
     print("✅ 论坛爬虫模块导入成功")
-except ImportError as e:
-    print(f"❌ 论坛爬虫导入失败: {e}")
-    FORUM_CRAWLER_AVAILABLE = False
+    return get_forum_crawler_manager
+
+
+# 连接空闲超过该时长（纳秒）后，工作节点可能已关闭keep-alive连接，GET请求出现连接错误时重试一次
+IDLE_CONNECTION_HEALTHY_NS = 10_000_000_000
+
+# 监控租约的比较并续期/比较并删除：仍由本实例持有时才操作，在Redis端原子执行
+_RENEW_LEASE_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LEASE_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# machines.txt 行格式：IP:端口[:优先级]，优先级后可跟 # 注释
+_MACHINE_LINE_RE = re.compile(r'^([^:#\s]+)\s*:\s*(\d+)\s*(?::\s*(\d*))?\s*(?:#.*)?$')
 
 
 class SimpleMachine:
     """简单机器信息"""
+    __slots__ = ('host', 'port', 'priority', 'url', 'is_online', 'is_busy',
+                 'current_tasks', 'last_check', 'response_time', 'last_error')
+
     def __init__(self, host: str, port: int, priority: int = 5):
         self.host = host
         self.port = port
@@ -70,19 +104,59 @@ class SimpleMachine:
         self.is_busy = False
         self.current_tasks = 0
         self.last_check = None
+        self.response_time = None
+        self.last_error = None
+
+    def to_dict(self) -> Dict:
+        """接口/页面使用的机器状态字典"""
+        return {
+            'url': self.url,
+            'host': self.host,
+            'port': self.port,
+            'priority': self.priority,
+            'is_online': self.is_online,
+            'is_busy': self.is_busy,
+            'current_tasks': self.current_tasks,
+            'last_check': self.last_check
+        }
+
+
+def _build_metadata(post: Dict, discovered_at: str) -> Dict:
+    """构建论坛帖子任务的metadata"""
+    thread_id = post.get('thread_id')
+    return dict(
+        post_id=thread_id,
+        source_url=post.get('thread_url'),  # 统一使用 source_url
+        thread_id=thread_id,
+        discovered_at=discovered_at,
+        forum_name=post.get('forum_name', '智能剪口播'),
+        source='forum',
+        category=post.get('category', ''),  # 🎯 Discuz分类信息字段
+    )
+
+
+def _machine_rank(machine: SimpleMachine) -> tuple:
+    """机器选择排序键：空闲机器排在前面，空闲时比优先级，忙碌时比任务数"""
+    if machine.is_busy:
+        return (True, machine.current_tasks, machine.priority)
+    return (False, machine.priority, machine.current_tasks)
 
 
 class ForumMonitor:
     """集群监控器"""
+
+    # machines.txt 解析缓存：(文件路径, st_mtime_ns, ((host, port, priority), ...))
+    _machines_cache: Optional[tuple] = None
     
     def __init__(self, port: int = 8000):
         self.port = port
         self.app = Flask(__name__)
         self.config = MonitorConfig()
         self.dispatch_mode = getattr(self.config, 'TASK_DISPATCH_MODE', 'cluster').lower()
-        self.queue_manager: Optional[QueueManager] = None
+        self.queue_manager = None  # 本地队列管理器，仅 local/hybrid 模式按需导入并创建
         if self.dispatch_mode in {'local', 'hybrid'}:
             try:
+                from web_hub.lightweight.queue_manager import QueueManager
                 self.queue_manager = QueueManager()
                 print(f"✅ 本地队列管理器初始化成功 (模式: {self.dispatch_mode})")
             except Exception as exc:
@@ -97,11 +171,42 @@ class ForumMonitor:
         
         # 处理机器列表
         self.machines: List[SimpleMachine] = []
+        # 在线机器数：只在机器上下线时增减，页面/接口直接读取
+        self._online_count = 0
+        self._online_lock = threading.Lock()
         self.load_machines()
+
+        # 机器状态并发探测：共享线程池和HTTP连接池，总耗时取决于最慢的一台而不是所有机器之和
+        self._probe_pool = ThreadPoolExecutor(max_workers=min(32, len(self.machines) or 1),
+                                              thread_name_prefix="probe")
+        # 每台机器最近一次提交的探测任务（按URL），上一次未结束时不再重复提交
+        self._probe_futures: Dict[str, Future] = {}
+        self._probe_submit_lock = threading.Lock()
+        self.http_session = requests.Session()
+        self.http_session.headers['Connection'] = 'keep-alive'
+        # 不在适配器层重试：探测失败由下一轮检查兜底，任务发送失败由调用方处理
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0)
+        self.http_session.mount('http://', adapter)
+        self.http_session.mount('https://', adapter)
+        # 每台机器最近一次请求完成的时间（monotonic_ns），用于判断复用的连接是否可能已失效
+        self._origin_last_used: Dict[str, int] = {}
         
+        # 运行时长（单调时钟）和页面用的格式化缓存：(缓存时间, 运行秒数, 格式化字符串, 在线机器数)
+        self._start_monotonic = time.monotonic()
+        self._uptime_cache = (0.0, 0, "", 0)
+        # 监控页面渲染结果缓存：模板名 -> (渲染时间, HTML)，1秒内的轮询直接返回
+        self._render_cache: Dict[str, tuple] = {}
+
         # 论坛监控
         self.monitoring_active = False
         self.monitor_thread = None
+        # 论坛空闲时逐步拉长检查间隔（最多8倍），有新帖立即恢复
+        self._idle_streak = 0
+        self._base_interval = self.config.CHECK_INTERVAL
+        self._max_interval = self._base_interval * 8
+        # 多副本部署时只有持有Redis租约的实例运行监控循环，其余实例只提供API
+        self._instance_id = f"{socket.gethostname()}:{self.port}:{uuid.uuid4()}"
+        self._is_leader = False
 
         # 初始化SQLite + Redis数据管理器
         try:
@@ -119,9 +224,22 @@ class ForumMonitor:
                 print(f"⚠️ 独立数据管理器也初始化失败: {e2}")
                 self.data_manager = None
 
+        # 复用数据管理器的Redis连接做分发去重（跨重启、跨监控副本生效）
+        self.redis = getattr(self.data_manager, 'redis_client', None)
+        self.redis_prefix = getattr(self.data_manager, 'redis_prefix', 'forum_monitor:')
+        if self.redis:
+            self._renew_lease = self.redis.register_script(_RENEW_LEASE_LUA)
+            self._release_lease = self.redis.register_script(_RELEASE_LEASE_LUA)
+        # Redis不可用时的进程内去重记录 thread_id -> 登记时间（setdefault一步完成查重和登记）
+        self.dispatched_tasks: Dict[str, float] = {}
+        self._last_dispatch_prune = time.time()
+
         # 论坛爬虫
         self.forum_crawler = None
-        if FORUM_CRAWLER_AVAILABLE and self.config.FORUM_MONITORING_ENABLED:
+        get_forum_crawler_manager = (
+            _import_forum_crawler_manager() if self.config.FORUM_MONITORING_ENABLED else None
+        )
+        if get_forum_crawler_manager:
             try:
                 # 获取论坛账号信息
                 username = self.config.FORUM_USERNAME
@@ -191,10 +309,16 @@ class ForumMonitor:
                 'local_tasks_queued': 0
             }
             print("📊 使用原始统计数据")
+        # 统计计数由监控线程和请求线程共同更新，+= 不是原子操作
+        self._stats_lock = threading.Lock()
+        # get_current_stats 的短时缓存：(生成时间, 统计字典)
+        self._current_stats_cache = (0.0, None)
+        # /api/status 中数据管理器统计的短时缓存：(生成时间, (data_stats, mock_stats))
+        self._status_cache = (0.0, None)
+        self._status_lock = threading.Lock()
+        # 监控线程每轮的统计增量（见 add_real_stat）
+        self._stats_local = threading.local()
 
-        # 集群监控系统的已处理任务记录
-        self.dispatched_tasks = set()  # 记录已分发的任务，避免重复分发
-        
         # 设置路由
         self.setup_routes()
 
@@ -209,24 +333,93 @@ class ForumMonitor:
         print("🚀 集群监控器初始化完成")
     
     def get_current_stats(self) -> Dict:
-        """获取当前统计数据（模拟数据与真实数据合并）"""
-        if self.mock_data_manager:
-            # 从模拟数据管理器获取最新的合并数据
-            return self.mock_data_manager.get_combined_stats()
-        else:
-            # 返回原始统计数据
-            return self.stats.copy()
+        """获取当前统计数据（模拟数据与真实数据合并），0.5秒内的并发请求共用一份结果"""
+        now = time.monotonic()
+        cached_at, cached = self._current_stats_cache
+        if cached is not None and now - cached_at < 0.5:
+            return cached
+        with self._stats_lock:
+            cached_at, cached = self._current_stats_cache
+            if cached is not None and now - cached_at < 0.5:
+                return cached
+            if self.mock_data_manager:
+                # 从模拟数据管理器获取最新的合并数据
+                fresh = self.mock_data_manager.get_combined_stats()
+            else:
+                # 返回原始统计数据
+                fresh = self.stats.copy()
+            self._current_stats_cache = (now, fresh)
+            return fresh
     
     def add_real_stat(self, key: str, value: int = 1):
-        """添加真实统计数据"""
+        """添加真实统计数据（监控循环内先在线程本地累加，每轮结束时统一提交）"""
+        pending = getattr(self._stats_local, 'pending', None)
+        if pending is not None:
+            pending[key] = pending.get(key, 0) + value
+            return
+        self._apply_stats({key: value})
+
+    def _apply_stats(self, counts: Dict[str, int]):
+        """提交一批统计增量"""
         if self.mock_data_manager:
             # 添加到模拟数据管理器的真实数据偏移中
-            self.mock_data_manager.add_real_data(key, value)
+            for key, value in counts.items():
+                self.mock_data_manager.add_real_data(key, value)
         else:
-            # 直接更新原始统计数据
-            if key in self.stats:
-                self.stats[key] += value
+            # 直接更新原始统计数据，一次加锁提交整批
+            with self._stats_lock:
+                for key, value in counts.items():
+                    if key in self.stats:
+                        self.stats[key] += value
+
+    def _flush_local_stats(self):
+        """提交当前线程本轮累加的统计数据并结束累加"""
+        pending = getattr(self._stats_local, 'pending', None)
+        self._stats_local.pending = None
+        if pending:
+            self._apply_stats(pending)
     
+    def _cached_status_payload(self, ttl: float = 0.5):
+        """返回 (数据管理器统计, 模拟数据状态)；ttl 内复用结果，缓存过期时只有一个请求去查询，其余等待共用"""
+        cached_at, payload = self._status_cache
+        if payload is not None and time.monotonic() - cached_at < ttl:
+            return payload
+        with self._status_lock:
+            cached_at, payload = self._status_cache
+            if payload is not None and time.monotonic() - cached_at < ttl:
+                return payload
+            data_stats = self.data_manager.get_statistics() if self.data_manager else {}
+            mock_stats = self.mock_data_manager.get_status() if self.mock_data_manager else {}
+            payload = (data_stats, mock_stats)
+            self._status_cache = (time.monotonic(), payload)
+            return payload
+
+    def _uptime_info(self):
+        """返回 (运行秒数, 格式化运行时长, 在线机器数)，1秒内重复调用直接复用结果"""
+        now = time.monotonic()
+        cached_at, seconds, formatted, online = self._uptime_cache
+        if now - cached_at < 1.0:
+            return seconds, formatted, online
+        seconds = int(now - self._start_monotonic)
+        hours, rem = divmod(seconds, 3600)
+        minutes, secs = divmod(rem, 60)
+        formatted = f"{hours}h {minutes}m {secs}s"
+        online = self._online_count
+        self._uptime_cache = (now, seconds, formatted, online)
+        return seconds, formatted, online
+
+    def _get_cached_page(self, name: str, ttl: float = 1.0) -> Optional[str]:
+        """返回 ttl 秒内渲染过的页面，过期或不存在时返回None"""
+        hit = self._render_cache.get(name)
+        if hit and time.monotonic() - hit[0] < ttl:
+            return hit[1]
+        return None
+
+    def _cache_page(self, name: str, html: str) -> str:
+        """记录页面渲染结果并原样返回"""
+        self._render_cache[name] = (time.monotonic(), html)
+        return html
+
     def setup_logging(self):
         """设置日志"""
         import sys
@@ -234,22 +427,29 @@ class ForumMonitor:
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
 
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
         # 🎯 确保控制台输出使用UTF-8编码
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        console_handler.setFormatter(formatter)
 
         # 设置控制台编码为UTF-8
         if hasattr(sys.stdout, 'reconfigure'):
             sys.stdout.reconfigure(encoding='utf-8')
 
+        file_handler = logging.FileHandler(f'{log_dir}/forum_monitor.log', encoding='utf-8')
+        file_handler.setFormatter(formatter)
+
+        # 业务线程（监控循环、请求线程）只把日志放入队列，由后台监听线程统一写文件和控制台
+        log_queue = SimpleQueue()
+        self._log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
+
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(f'{log_dir}/forum_monitor.log', encoding='utf-8'),
-                console_handler
-            ]
+            handlers=[QueueHandler(log_queue)]
         )
         self.logger = logging.getLogger(__name__)
     
@@ -269,55 +469,53 @@ class ForumMonitor:
             print(f"📝 已创建示例配置文件: {machines_file}")
         
         try:
-            line_number = 0
-            valid_machines = 0
+            mtime = os.stat(machines_file).st_mtime_ns
+            cached = ForumMonitor._machines_cache
+            if cached and cached[0] == machines_file and cached[1] == mtime:
+                # 文件未修改，直接复用上次的解析结果
+                self.machines = [SimpleMachine(host, port, priority) for host, port, priority in cached[2]]
+                self._online_count = 0
+                return
 
             with open(machines_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line_number += 1
-                    line = line.strip()
-
-                    # 跳过空行和注释
-                    if not line or line.startswith('#'):
-                        continue
-
-                    # 验证配置格式
-                    parts = line.split(':')
-                    if len(parts) < 2:
-                        print(f"⚠️ 第{line_number}行格式错误: {line}")
-                        print("   正确格式: IP地址:端口:优先级")
-                        continue
-
-                    try:
-                        host = parts[0].strip()
-                        port = int(parts[1].strip())
-
-                        # 处理优先级字段，去除注释
-                        priority_str = parts[2].strip() if len(parts) > 2 else "5"
-                        # 如果有注释，只取注释前的部分
-                        if '#' in priority_str:
-                            priority_str = priority_str.split('#')[0].strip()
-                        priority = int(priority_str) if priority_str else 5
-
-                        # 验证端口范围
-                        if not (1 <= port <= 65535):
-                            print(f"⚠️ 第{line_number}行端口无效: {port} (应在1-65535之间)")
-                            continue
-
-                        # 验证优先级范围
-                        if not (1 <= priority <= 10):
-                            print(f"⚠️ 第{line_number}行优先级建议在1-10之间: {priority}")
-
-                        machine = SimpleMachine(host, port, priority)
-                        self.machines.append(machine)
-                        valid_machines += 1
-
-                    except ValueError as e:
-                        print(f"⚠️ 第{line_number}行数据格式错误: {line} - {e}")
-                        continue
-
-            if valid_machines > 0:
-                print(f"📋 成功加载 {valid_machines} 台处理机器:")
+                lines = f.read().splitlines()
+
+            parsed = []
+            for line_number, line in enumerate(lines, 1):
+                line = line.strip()
+
+                # 跳过空行和注释
+                if not line or line.startswith('#'):
+                    continue
+
+                # 验证配置格式
+                match = _MACHINE_LINE_RE.match(line)
+                if not match:
+                    print(f"⚠️ 第{line_number}行格式错误: {line}")
+                    print("   正确格式: IP地址:端口:优先级")
+                    continue
+
+                host, port_str, priority_str = match.groups()
+                port = int(port_str)
+                priority = int(priority_str) if priority_str else 5
+
+                # 验证端口范围
+                if not (1 <= port <= 65535):
+                    print(f"⚠️ 第{line_number}行端口无效: {port} (应在1-65535之间)")
+                    continue
+
+                # 验证优先级范围
+                if not (1 <= priority <= 10):
+                    print(f"⚠️ 第{line_number}行优先级建议在1-10之间: {priority}")
+
+                parsed.append((host, port, priority))
+
+            ForumMonitor._machines_cache = (machines_file, mtime, tuple(parsed))
+            self.machines = [SimpleMachine(host, port, priority) for host, port, priority in parsed]
+            self._online_count = 0
+
+            if parsed:
+                print(f"📋 成功加载 {len(parsed)} 台处理机器:")
                 for machine in self.machines:
                     print(f"   - {machine.url} (优先级: {machine.priority})")
             else:
@@ -334,45 +532,36 @@ class ForumMonitor:
         @self.app.route('/')
         def index():
             """主页 - 显示监控状态"""
+            cached = self._get_cached_page('index.html')
+            if cached is not None:
+                return cached
+
             current_stats = self.get_current_stats()
-            uptime = datetime.now() - current_stats['start_time']
-            uptime_seconds = int(uptime.total_seconds())
-            uptime_str = f"{uptime_seconds//3600}h {(uptime_seconds%3600)//60}m {uptime_seconds%60}s"
-            online_machines = sum(1 for m in self.machines if m.is_online)
+            _, uptime_str, online_machines = self._uptime_info()
 
-            return render_template('index.html',
+            return self._cache_page('index.html', render_template('index.html',
                                  monitoring_active=self.monitoring_active,
                                  stats=current_stats,
                                  machines=self.machines,
                                  port=self.port,
                                         uptime_str=uptime_str,
                                         online_machines=online_machines,
-                                        total_machines=len(self.machines))
+                                        total_machines=len(self.machines)))
 
         @self.app.route('/map')
         def map_dashboard():
             """地图监控页面 - 石家庄中心化视图"""
+            cached = self._get_cached_page('map_dashboard.html')
+            if cached is not None:
+                return cached
+
             current_stats = self.get_current_stats()
-            uptime = datetime.now() - current_stats['start_time']
-            uptime_seconds = int(uptime.total_seconds())
-            uptime_str = f"{uptime_seconds//3600}h {(uptime_seconds%3600)//60}m {uptime_seconds%60}s"
-            online_machines = sum(1 for m in self.machines if m.is_online)
+            _, uptime_str, online_machines = self._uptime_info()
 
             # 准备机器数据的JSON格式
-            machines_json = []
-            for machine in self.machines:
-                machines_json.append({
-                    'url': machine.url,
-                    'host': machine.host,
-                    'port': machine.port,
-                    'priority': machine.priority,
-                    'is_online': machine.is_online,
-                    'is_busy': machine.is_busy,
-                    'current_tasks': machine.current_tasks,
-                    'last_check': machine.last_check
-                })
+            machines_json = [machine.to_dict() for machine in self.machines]
 
-            return render_template('map_dashboard.html',
+            return self._cache_page('map_dashboard.html', render_template('map_dashboard.html',
                                  monitoring_active=self.monitoring_active,
                                  stats=current_stats,
                                  machines=self.machines,
@@ -380,7 +569,7 @@ class ForumMonitor:
                                  port=self.port,
                                  uptime_str=uptime_str,
                                  online_machines=online_machines,
-                                 total_machines=len(self.machines))
+                                 total_machines=len(self.machines)))
 
         @self.app.route('/map-test')
         def map_test():
@@ -395,19 +584,10 @@ class ForumMonitor:
         @self.app.route('/api/machines')
         def get_machines():
             """获取机器列表"""
-            machines_data = []
-            for machine in self.machines:
-                machines_data.append({
-                    'url': machine.url,
-                    'host': machine.host,
-                    'port': machine.port,
-                    'priority': machine.priority,
-                    'is_online': machine.is_online,
-                    'is_busy': machine.is_busy,
-                    'current_tasks': machine.current_tasks,
-                    'last_check': machine.last_check
-                })
-            return jsonify({'machines': machines_data})
+            payload = {'machines': [machine.to_dict() for machine in self.machines]}
+            if orjson is not None:
+                return self.app.response_class(orjson.dumps(payload), mimetype='application/json')
+            return jsonify(payload)
         
         @self.app.route('/api/start-monitoring', methods=['POST'])
         def start_monitoring():
@@ -487,23 +667,17 @@ class ForumMonitor:
         def get_status():
             """获取监控器状态"""
             current_stats = self.get_current_stats()
-            uptime = datetime.now() - current_stats['start_time']
+            uptime_seconds, _, online_machines = self._uptime_info()
 
-            # 获取数据管理器统计
-            data_stats = {}
-            if self.data_manager:
-                data_stats = self.data_manager.get_statistics()
-
-            # 获取模拟数据管理器状态
-            mock_stats = {}
-            if self.mock_data_manager:
-                mock_stats = self.mock_data_manager.get_status()
+            # 获取数据管理器统计和模拟数据管理器状态（短时缓存，并发请求只查询一次）
+            data_stats, mock_stats = self._cached_status_payload()
 
             return jsonify({
                 'monitoring_active': self.monitoring_active,
-                'uptime_seconds': int(uptime.total_seconds()),
+                'is_leader': self._is_leader,
+                'uptime_seconds': uptime_seconds,
                 'machines_count': len(self.machines),
-                'online_machines': sum(1 for m in self.machines if m.is_online),
+                'online_machines': online_machines,
                 'stats': current_stats,
                 'data_stats': data_stats,
                 'mock_stats': mock_stats,
@@ -612,6 +786,7 @@ class ForumMonitor:
     def stop_forum_monitoring(self):
         """停止论坛监控"""
         self.monitoring_active = False
+        self._release_leadership()
         print("🛑 论坛监控已停止")
         self.logger.info("论坛监控已停止")
     
@@ -619,13 +794,23 @@ class ForumMonitor:
         """监控主循环"""
         while self.monitoring_active:
             try:
-                # 检查机器状态
-                self.check_all_machines()
+                # 其他副本持有租约时只等待，租约过期后接管
+                if not self._hold_leadership(self._base_interval * 3):
+                    time.sleep(self._base_interval)
+                    continue
+
+                # 本轮统计先在线程本地累加
+                self._stats_local.pending = {}
+
+                # 检查机器状态（长时间空闲时隔一轮检查一次）
+                if self._idle_streak <= 5 or self._idle_streak % 2 == 0:
+                    self.check_all_machines()
                 
                 # 检查论坛新帖（这里可以集成真实的论坛监控逻辑）
                 if self.config.FORUM_MONITORING_ENABLED:
                     new_posts = self.check_forum_posts()
                     self.stats['last_forum_check'] = datetime.now().strftime('%H:%M:%S')
+                    self._idle_streak = 0 if new_posts else self._idle_streak + 1
                     
                     if new_posts:
                         # 使用新的统计方法
@@ -636,15 +821,58 @@ class ForumMonitor:
                         # 为每个新帖分发任务
                         for post in new_posts:
                             self.dispatch_task(post)
+
+                    self._prune_dispatched()
                 
-                # 等待指定间隔
-                time.sleep(self.config.CHECK_INTERVAL)
+                # 等待指定间隔：连续无新帖时指数退避
+                interval = min(self._max_interval, self._base_interval * (2 ** min(self._idle_streak, 3)))
+                # 租约覆盖本次等待和下一轮检查
+                self._hold_leadership(interval + self._base_interval * 2)
+                self._flush_local_stats()
+                time.sleep(interval)
                 
             except Exception as e:
                 print(f"❌ 监控循环异常: {e}")
                 self.logger.error(f"监控循环异常: {e}")
+                self._flush_local_stats()
                 time.sleep(30)
     
+    def _leader_key(self) -> str:
+        return f"{self.redis_prefix}leader"
+
+    def _hold_leadership(self, ttl: int) -> bool:
+        """获取（SET NX EX）或原子续期监控租约，返回本实例是否为leader；Redis不可用时单实例运行，始终为leader"""
+        if not self.redis:
+            self._is_leader = True
+            return True
+        try:
+            key = self._leader_key()
+            ttl = max(1, int(ttl))
+            if self.redis.set(key, self._instance_id, nx=True, ex=ttl):
+                is_leader = True
+            else:
+                # 读取持有者和续期必须原子完成，否则租约恰好过期并被其他副本抢到时会误续对方的租约
+                is_leader = bool(self._renew_lease(keys=[key], args=[self._instance_id, ttl]))
+        except Exception as e:
+            # Redis暂时不可用时保持当前角色，避免多个副本同时接管
+            self.logger.warning(f"监控租约检查失败: {e}")
+            return self._is_leader
+
+        if is_leader != self._is_leader:
+            self.logger.info("本实例成为监控leader" if is_leader else "监控leader为其他实例，暂停本地监控")
+        self._is_leader = is_leader
+        return is_leader
+
+    def _release_leadership(self):
+        """停止监控时释放本实例持有的租约，其他副本可立即接管"""
+        if not self.redis or not self._is_leader:
+            return
+        try:
+            self._release_lease(keys=[self._leader_key()], args=[self._instance_id])
+        except Exception as e:
+            self.logger.warning(f"释放监控租约失败: {e}")
+        self._is_leader = False
+
     def check_forum_posts(self):
         """检查论坛新帖（真实实现）"""
         try:
@@ -660,14 +888,11 @@ class ForumMonitor:
 
             if new_posts:
                 print(f"✅ 发现 {len(new_posts)} 个新帖子")
-                # 🎯 处理每个帖子，构建任务数据
+                # 🎯 处理每个帖子，构建任务数据（同一批帖子共用一个发现时间）
+                discovered_at = datetime.now().isoformat()
                 tasks = []
-                for post in new_posts:
-                    # 🎯 从cover_info中提取封面标题
-                    cover_info = post.get('cover_info', {})
-                    cover_title_up = cover_info.get('cover_title_up', '')
-                    cover_title_down = cover_info.get('cover_title_down', '')
-
+                # 已被本进程或其他监控副本分发过的帖子直接跳过（整批一次往返登记）
+                for post in self._claim_dispatches(new_posts):
                     # 🎯 监控节点：只传递URL和基本信息，让工作节点自己处理
                     task = {
                         'title': post.get('title', '未知标题'),
@@ -676,15 +901,7 @@ class ForumMonitor:
                         'audio_urls': post.get('audio_urls', []),  # 🎯 音频链接
                         'original_filenames': post.get('original_filenames', []),
                         'category': post.get('category', ''),  # 🎯 Discuz分类信息字段
-                        'metadata': {
-                            'post_id': post.get('thread_id'),
-                            'source_url': post.get('thread_url'),  # 统一使用 source_url
-                            'thread_id': post.get('thread_id'),
-                            'discovered_at': datetime.now().isoformat(),
-                            'forum_name': post.get('forum_name', '智能剪口播'),
-                            'source': 'forum',
-                            'category': post.get('category', '')  # 🎯 Discuz分类信息字段
-                        }
+                        'metadata': _build_metadata(post, discovered_at)
                     }
 
                     # 🎯 监控节点只负责传递原始数据，不做任务类型判断
@@ -711,23 +928,124 @@ class ForumMonitor:
 
 
 
+    def _claim_dispatches(self, posts: List[Dict]) -> List[Dict]:
+        """批量登记分发并返回此前未分发过的帖子
+
+        Redis可用时用一个pipeline对每个thread_id执行SET NX（24小时过期），一次往返完成查重和登记；
+        Redis不可用或本次调用失败时退回进程内记录（Redis登记成功的帖子也会记入进程内，保证短暂故障期间仍能去重）。
+        """
+        thread_ids = [post.get('thread_id') for post in posts]
+        claimed = None
+        if self.redis:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for thread_id in thread_ids:
+                    if thread_id:
+                        pipe.set(f"{self.redis_prefix}dispatched:{thread_id}", "1", nx=True, ex=86400)
+                results = iter(pipe.execute())
+                claimed = [next(results) is not None if thread_id else True for thread_id in thread_ids]
+            except Exception as e:
+                self.logger.warning(f"Redis分发去重失败，使用进程内记录: {e}")
+                claimed = None
+        if claimed is None:
+            claimed = []
+            for thread_id in thread_ids:
+                # 每个帖子使用独立的时间对象，setdefault返回它本身说明是首次登记
+                stamp = time.time()
+                claimed.append(not thread_id or self.dispatched_tasks.setdefault(thread_id, stamp) is stamp)
+        else:
+            now = time.time()
+            for thread_id, is_new in zip(thread_ids, claimed):
+                if thread_id and is_new:
+                    self.dispatched_tasks.setdefault(thread_id, now)
+
+        fresh = []
+        for post, is_new in zip(posts, claimed):
+            if is_new:
+                fresh.append(post)
+            else:
+                print(f"⏭️ 跳过已分发帖子: {post.get('title', '未知标题')}")
+        return fresh
+
+    def _release_dispatch(self, thread_id):
+        """分发失败时撤销登记，允许下次重新分发"""
+        if not thread_id:
+            return
+        self.dispatched_tasks.pop(thread_id, None)
+        if not self.redis:
+            return
+        try:
+            self.redis.delete(f"{self.redis_prefix}dispatched:{thread_id}")
+        except Exception as e:
+            self.logger.warning(f"Redis分发登记撤销失败: {e}")
+
+    def _prune_dispatched(self):
+        """每小时清理一次超过24小时的进程内分发记录"""
+        now = time.time()
+        if now - self._last_dispatch_prune < 3600:
+            return
+        self._last_dispatch_prune = now
+        cutoff = now - 86400
+        for thread_id, dispatched_at in list(self.dispatched_tasks.items()):
+            if dispatched_at < cutoff:
+                self.dispatched_tasks.pop(thread_id, None)
+
     def check_all_machines(self):
         """检查所有机器状态"""
         print("🔍 检查所有机器状态...")
-        for machine in self.machines:
-            self.check_machine_status(machine)
+        # 同一台机器同时最多只有一个探测任务在写它的状态，机器字段无需加锁（锁只保护提交）：
+        # 上一轮超时未结束的探测仍在写入该机器时跳过本轮，而不是再提交一个
+        futures = []
+        with self._probe_submit_lock:
+            for machine in self.machines:
+                pending = self._probe_futures.get(machine.url)
+                if pending is not None and not pending.done():
+                    continue
+                future = self._probe_pool.submit(self.check_machine_status, machine)
+                self._probe_futures[machine.url] = future
+                futures.append(future)
+        _, not_done = wait_futures(futures, timeout=5)
+        if not_done:
+            self.logger.warning(f"部分机器状态检查超时（{len(not_done)}台）")
     
+    def _worker_request(self, method: str, machine: SimpleMachine, path: str, **kwargs) -> requests.Response:
+        """通过共享会话请求工作节点
+
+        最近10秒内用过的连接直接复用、出错即失败；空闲更久的连接可能已被工作节点关闭，
+        GET请求出现连接错误时换新连接重试一次。POST（如下发任务）不重试，
+        避免请求已被工作节点接收时重复下发。
+        """
+        url = f"{machine.url}{path}"
+        last_used = self._origin_last_used.get(machine.url)
+        try:
+            response = self.http_session.request(method, url, **kwargs)
+        except requests.exceptions.ConnectionError:
+            if (method != 'GET' or last_used is None
+                    or time.monotonic_ns() - last_used < IDLE_CONNECTION_HEALTHY_NS):
+                raise
+            self._origin_last_used.pop(machine.url, None)
+            response = self.http_session.request(method, url, **kwargs)
+        self._origin_last_used[machine.url] = time.monotonic_ns()
+        return response
+
+    def _set_online(self, machine: SimpleMachine, online: bool):
+        """更新机器在线状态，状态变化时同步调整在线机器数"""
+        with self._online_lock:
+            if online != machine.is_online:
+                self._online_count += 1 if online else -1
+            machine.is_online = online
+
     def check_machine_status(self, machine: SimpleMachine):
         """检查单个机器状态 - 优化版本"""
         try:
             start_time = time.time()
             # 🎯 关键修复：使用正确的工作节点状态端点
-            response = requests.get(f"{machine.url}/api/worker/status", timeout=3)
+            response = self._worker_request('GET', machine, "/api/worker/status", timeout=(1, 3))
             response_time = time.time() - start_time
 
             if response.status_code == 200:
                 data = response.json()
-                machine.is_online = True
+                self._set_online(machine, True)
                 machine.is_busy = data.get('is_busy', False)
                 machine.current_tasks = data.get('total_queue_size', 0)  # 使用正确的字段名
                 machine.last_check = datetime.now().strftime('%H:%M:%S')
@@ -739,11 +1057,11 @@ class ForumMonitor:
                 if queue_sizes:
                     print(f"📊 工作节点 {machine.url} 队列状态: {queue_sizes}")
             else:
-                machine.is_online = False
+                self._set_online(machine, False)
                 machine.last_error = f"HTTP {response.status_code}"
                 
         except Exception as e:
-            machine.is_online = False
+            self._set_online(machine, False)
             machine.is_busy = False
             machine.current_tasks = 0
             machine.last_error = str(e)[:100]  # 限制错误信息长度
@@ -810,6 +1128,23 @@ class ForumMonitor:
             self.logger.error(f"提交任务到本地队列失败: {exc}")
             return None
 
+    def _local_queue_has_room(self) -> bool:
+        """本地队列积压是否低于 LOCAL_QUEUE_HIGHWATER（阈值为0时不启用本地优先）"""
+        highwater = getattr(self.config, 'LOCAL_QUEUE_HIGHWATER', 0)
+        if not self.queue_manager or highwater <= 0:
+            return False
+        return sum(self.queue_manager.get_queue_sizes().values()) < highwater
+
+    def _record_local_dispatch(self, post_id: str, queued_id: str, message: str, log_message: str):
+        """记录任务已排入本地队列：更新帖子状态和统计"""
+        if self.data_manager:
+            self.data_manager.mark_post_dispatched(post_id, 'local_queue')
+        self.add_real_stat('total_tasks_sent', 1)
+        self.add_real_stat('successful_tasks', 1)
+        self.add_real_stat('local_tasks_queued', 1)
+        print(f"✅ {message} (任务ID: {queued_id})")
+        self.logger.info(log_message)
+
     def _format_task_data(self, task_data: Dict) -> Dict:
         """格式化任务数据以匹配工作节点期望的格式"""
         formatted_task = {}
@@ -968,18 +1303,12 @@ class ForumMonitor:
         if not online_machines:
             return None
 
-        # 优先选择空闲机器
-        idle_machines = [m for m in online_machines if not m.is_busy]
-        print(f"🔍 空闲机器: {len(idle_machines)} 台")
-        if idle_machines:
-            # 在空闲机器中选择优先级最高的
-            selected = min(idle_machines, key=lambda m: (m.priority, m.current_tasks))
+        # 一次遍历完成选择：空闲机器优先（按优先级、任务数），都在忙时选任务最少的
+        selected = min(online_machines, key=_machine_rank)
+        if not selected.is_busy:
             print(f"🎯 选择空闲机器: {selected.url} (优先级:{selected.priority})")
-            return selected
-
-        # 都在忙，选择任务最少的
-        selected = min(online_machines, key=lambda m: (m.current_tasks, m.priority))
-        print(f"🎯 选择忙碌机器: {selected.url} (任务数:{selected.current_tasks})")
+        else:
+            print(f"🎯 选择忙碌机器: {selected.url} (任务数:{selected.current_tasks})")
         return selected
     
     def dispatch_task(self, post_data: Dict):
@@ -1006,28 +1335,34 @@ class ForumMonitor:
             print(f"❌ 格式化任务数据失败: {e}")
             if self.data_manager:
                 self.data_manager.mark_post_failed(post_id, f"格式化任务数据失败: {e}")
+            self._release_dispatch(post_id)
             return
 
         # 本地队列模式直接提交
         if self.dispatch_mode == 'local':
             queued_id = self._submit_to_local_queue(post_data, formatted_task)
             if queued_id:
-                if self.data_manager:
-                    self.data_manager.mark_post_dispatched(post_id, 'local_queue')
-                self.add_real_stat('total_tasks_sent', 1)
-                self.add_real_stat('successful_tasks', 1)
-                self.add_real_stat('local_tasks_queued', 1)
-                print(f"✅ 任务已排入本地队列: {title} (任务ID: {queued_id})")
-                self.logger.info(f"任务排入本地队列: {post_id}")
+                self._record_local_dispatch(post_id, queued_id,
+                                            f"任务已排入本地队列: {title}", f"任务排入本地队列: {post_id}")
             else:
                 if self.data_manager:
                     self.data_manager.mark_post_failed(post_id, "本地队列提交失败")
+                self._release_dispatch(post_id)
                 self.add_real_stat('total_tasks_sent', 1)
                 self.add_real_stat('failed_tasks', 1)
                 print(f"❌ 提交任务到本地队列失败: {title}")
                 self.logger.error(f"提交任务到本地队列失败: {post_id}")
             return
 
+        # 混合模式：本地队列积压低于阈值时直接入队，省去HTTP分发；入队失败再走集群
+        if self.dispatch_mode == 'hybrid' and self._local_queue_has_room():
+            queued_id = self._submit_to_local_queue(post_data, formatted_task)
+            if queued_id:
+                self._record_local_dispatch(post_id, queued_id,
+                                            f"本地队列空闲，任务直接排入本地队列: {title}",
+                                            f"本地队列空闲，任务直接排入本地队列: {post_id}")
+                return
+
         machine = self.select_best_machine()
         if machine:
             success = self.send_task_to_machine(machine, formatted_task)
@@ -1047,17 +1382,13 @@ class ForumMonitor:
             if self.dispatch_mode == 'hybrid':
                 queued_id = self._submit_to_local_queue(post_data, formatted_task)
                 if queued_id:
-                    if self.data_manager:
-                        self.data_manager.mark_post_dispatched(post_id, 'local_queue')
-                    self.add_real_stat('total_tasks_sent', 1)
-                    self.add_real_stat('successful_tasks', 1)
-                    self.add_real_stat('local_tasks_queued', 1)
-                    print(f"✅ 失败后切换到本地队列: {title} (任务ID: {queued_id})")
-                    self.logger.info(f"任务发送失败后改为本地队列: {post_id}")
+                    self._record_local_dispatch(post_id, queued_id,
+                                                f"失败后切换到本地队列: {title}", f"任务发送失败后改为本地队列: {post_id}")
                     return
 
             if self.data_manager:
                 self.data_manager.mark_post_failed(post_id, "任务发送失败")
+            self._release_dispatch(post_id)
             self.add_real_stat('total_tasks_sent', 1)
             self.add_real_stat('failed_tasks', 1)
             self.logger.error(f"任务发送失败且未能回退: {post_id}")
@@ -1070,17 +1401,13 @@ class ForumMonitor:
         if self.dispatch_mode == 'hybrid':
             queued_id = self._submit_to_local_queue(post_data, formatted_task)
             if queued_id:
-                if self.data_manager:
-                    self.data_manager.mark_post_dispatched(post_id, 'local_queue')
-                self.add_real_stat('total_tasks_sent', 1)
-                self.add_real_stat('successful_tasks', 1)
-                self.add_real_stat('local_tasks_queued', 1)
-                print(f"✅ 无机器可用，任务排入本地队列: {title} (任务ID: {queued_id})")
-                self.logger.info(f"无机器可用，任务排入本地队列: {post_id}")
+                self._record_local_dispatch(post_id, queued_id,
+                                            f"无机器可用，任务排入本地队列: {title}", f"无机器可用，任务排入本地队列: {post_id}")
                 return
 
         if self.data_manager:
             self.data_manager.mark_post_failed(post_id, "没有可用的处理机器")
+        self._release_dispatch(post_id)
         self.add_real_stat('total_tasks_sent', 1)
         self.add_real_stat('failed_tasks', 1)
         self.logger.warning(f"没有可用的处理机器且未能回退: {post_id}")
@@ -1096,10 +1423,10 @@ class ForumMonitor:
         """发送任务到指定机器"""
         try:
             # 只使用集群工作节点API端点，不再回退到轻量级API
-            response = requests.post(
-                f"{machine.url}/api/worker/receive-task",
+            response = self._worker_request(
+                'POST', machine, "/api/worker/receive-task",
                 json=task_data,
-                timeout=30
+                timeout=(3, 30)
             )
 
             if response.status_code == 200:
@@ -1126,22 +1453,30 @@ class ForumMonitor:
         self.logger.info(f"监控器启动在端口 {self.port}")
 
         try:
-            from werkzeug.serving import run_simple
-            import logging
-            # 禁用werkzeug的日志警告
-            werkzeug_logger = logging.getLogger('werkzeug')
-            werkzeug_logger.setLevel(logging.ERROR)
-
-            run_simple('0.0.0.0', self.port, self.app,
-                      threaded=True,
-                      use_reloader=False,
-                      use_debugger=False,
-                      use_evalex=False)
+            try:
+                # 优先使用Waitress多线程服务器，接口请求不会阻塞监控线程
+                from waitress import serve
+                print("✅ 使用Waitress生产服务器")
+                serve(self.app, host='0.0.0.0', port=self.port, threads=16, channel_timeout=30)
+            except ImportError:
+                from werkzeug.serving import run_simple
+                import logging
+                # 禁用werkzeug的日志警告
+                werkzeug_logger = logging.getLogger('werkzeug')
+                werkzeug_logger.setLevel(logging.ERROR)
+
+                run_simple('0.0.0.0', self.port, self.app,
+                          threaded=True,
+                          use_reloader=False,
+                          use_debugger=False,
+                          use_evalex=False)
         except KeyboardInterrupt:
             print("\n🛑 收到停止信号")
             self.stop_forum_monitoring()
             if self.mock_data_manager:
                 self.mock_data_manager.stop_mock_updates()
+            self._probe_pool.shutdown(wait=False)
+            self.http_session.close()
         except Exception as e:
             print(f"❌ 运行异常: {e}")
             self.logger.error(f"运行异常: {e}")
@@ -1149,6 +1484,21 @@ class ForumMonitor:
                 self.mock_data_manager.stop_mock_updates()
 
 
+# 全局监控器实例：同一进程内的WSGI服务器线程共享机器列表和Redis连接
+_forum_monitor: Optional[ForumMonitor] = None
+_forum_monitor_lock = threading.Lock()
+
+
+def get_forum_monitor(port: int = 8000) -> ForumMonitor:
+    """获取集群监控器单例"""
+    global _forum_monitor
+    if _forum_monitor is None:
+        with _forum_monitor_lock:
+            if _forum_monitor is None:
+                _forum_monitor = ForumMonitor(port)
+    return _forum_monitor
+
+
 def main():
     """主函数"""
     import argparse
@@ -1159,7 +1509,7 @@ def main():
     args = parser.parse_args()
     
     # 创建并运行监控器
-    monitor = ForumMonitor(args.port)
+    monitor = get_forum_monitor(args.port)
     monitor.run()
 
 
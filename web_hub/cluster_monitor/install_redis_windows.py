@@ -4,6 +4,7 @@ Windows Redis 自动安装脚本
 自动下载并安装Redis服务器
 """
 
+import logging
 import os
 import sys
 import subprocess
@@ -195,4 +196,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # check_redis_simple 通过 logging 输出检测信息
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
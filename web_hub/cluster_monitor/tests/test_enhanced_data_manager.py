@@ -0,0 +1,62 @@
+"""
+测试 SQLiteRedisDataManager 的延迟写入（write-behind）落盘行为（pytest 版本，放置于 tests/ 目录）
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# 确保可以从上级目录导入 enhanced_data_manager.py
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir.parent))
+
+import enhanced_data_manager as edm
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """使用临时SQLite文件和内存Redis的数据管理器（开启延迟写入）"""
+    if not edm.REDIS_AVAILABLE:
+        pytest.skip("redis 模块不可用")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(edm.redis, "Redis", lambda **kwargs: fakeredis.FakeRedis(server=server))
+    m = edm.SQLiteRedisDataManager(db_path=str(tmp_path / "posts.db"))
+    assert m._writer_thread is not None
+    yield m
+    m.close()
+
+
+def _post(post_id, title="标题"):
+    return edm.ForumPostRecord(
+        post_id=post_id,
+        thread_id=post_id,
+        title=title,
+        author_name="作者",
+        source_url=f"https://example.com/thread-{post_id}-1-1.html",
+        discovered_time=datetime.now(),
+    )
+
+
+def test_save_post_rejects_missing_required_field(manager):
+    """缺少 NOT NULL 字段的帖子不进入延迟写入队列"""
+    assert manager.save_post(_post("bad", title=None)) is False
+    assert manager._pending_writes == []
+
+
+def test_bad_row_does_not_block_batch(manager):
+    """同一批中有写不进去的记录时，其他帖子照常落盘，坏记录被丢弃而不是无限重试"""
+    with manager._lock:
+        manager._pending_writes.extend([_post("good"), _post("bad", title=None)])
+        manager._flush_writes()
+
+        assert manager._pending_writes == []
+        assert [post.post_id for post in manager.dead_letters] == ["bad"]
+
+    assert manager.mark_post_dispatched("good", "http://worker:8001") is True
+    post = manager.get_post("good")
+    assert post is not None and post.processing_status == "dispatched"
+    assert manager.get_post("bad") is None
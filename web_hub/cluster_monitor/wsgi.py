@@ -11,12 +11,12 @@ import sys
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
-from forum_monitor import ForumMonitor
+from forum_monitor import get_forum_monitor
 
 # 创建应用实例
 def create_app(port=8000):  # 改为默认8000端口
     """创建Flask应用实例"""
-    monitor = ForumMonitor(port)
+    monitor = get_forum_monitor(port)
     return monitor.app
 
 # WSGI应用对象
@@ -11,9 +11,11 @@
 """
 
 import os
+import re
 import sys
 import time
 import threading
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from pathlib import Path
@@ -49,6 +51,33 @@ except ImportError:
     print("⚠️ 论坛爬虫不可用")
 
 
+# 标题/内容中的任务类型标记（【音色克隆】、[制作AI声音] 等写法都包含这两个关键词）
+_CLONE_MARKER = '音色克隆'
+_TTS_MARKER_RE = re.compile(r'制作(?:AI|ai)声音')
+
+
+@lru_cache(maxsize=1024)
+def _detect_task_type_cached(category: str, title: str, content: str):
+    """按 (分类, 标题, 内容) 判断任务类型，返回 (TaskType, 判断依据)；论坛重复/相似帖子直接命中缓存"""
+    from shared.task_model import TaskType
+
+    # 🎯 方法1: 优先使用论坛分类字段（最可靠）
+    if category:
+        if _CLONE_MARKER in category:
+            return TaskType.VOICE_CLONE, '分类'
+        if _TTS_MARKER_RE.search(category):
+            return TaskType.TTS, '分类'
+
+    # 🎯 方法2: 回退到标题和内容检测（兼容旧数据），音色克隆优先级高
+    if _CLONE_MARKER in title or _CLONE_MARKER in content:
+        return TaskType.VOICE_CLONE, '内容标记'
+    if _TTS_MARKER_RE.search(title) or _TTS_MARKER_RE.search(content):
+        return TaskType.TTS, '内容标记'
+
+    # 默认为视频处理
+    return TaskType.VIDEO, '默认'
+
+
 class ForumIntegration:
     """论坛集成管理器"""
 
@@ -360,51 +389,15 @@ class ForumIntegration:
         - 音色克隆 → 音色克隆任务
         - 其他 → 视频任务
         """
-        from shared.task_model import TaskType
-
-        # 🎯 方法1: 优先使用论坛分类字段（最可靠）
         category = (post.get('category') or '').strip()
         if category:
             self.logger.info(f"🏷️ 检测到论坛分类: {category}")
 
-            # 音色克隆分类
-            if '音色克隆' in category:
-                self.logger.info(f"✅ 根据分类判断为: 音色克隆")
-                return TaskType.VOICE_CLONE
-
-            # TTS分类
-            if '制作AI声音' in category or '制作ai声音' in category:
-                self.logger.info(f"✅ 根据分类判断为: TTS")
-                return TaskType.TTS
-
-        # 🎯 方法2: 回退到标题和内容检测（兼容旧数据）
-        title = (post.get('title') or '')
-        content = (post.get('content') or '')
-
-        # 音色克隆标记
-        clone_markers = ['【音色克隆】', '[音色克隆]', '音色克隆']
-
-        # TTS标记
-        tts_markers = [
-            '【制作AI声音】', '[制作AI声音]', '制作AI声音',
-            '【制作ai声音】', '[制作ai声音]', '制作ai声音'
-        ]
-
-        # 检查音色克隆（优先级高）
-        for marker in clone_markers:
-            if marker in title or marker in content:
-                self.logger.info(f"✅ 根据内容标记判断为: 音色克隆")
-                return TaskType.VOICE_CLONE
-
-        # 检查TTS
-        for marker in tts_markers:
-            if marker in title or marker in content:
-                self.logger.info(f"✅ 根据内容标记判断为: TTS")
-                return TaskType.TTS
-
-        # 默认为视频处理
-        self.logger.info(f"✅ 默认判断为: 视频")
-        return TaskType.VIDEO
+        task_type, source = _detect_task_type_cached(
+            category, post.get('title') or '', post.get('content') or ''
+        )
+        self.logger.info(f"✅ 根据{source}判断为: {task_type.value}")
+        return task_type
 
     def _process_new_post(self, post: Dict[str, Any]):
         """处理新帖子"""
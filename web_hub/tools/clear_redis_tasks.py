@@ -7,61 +7,111 @@
 
 import redis
 import json
+import logging
 import sys
 
+try:
+    import orjson  # 可选：C实现的JSON解析，大任务载荷解析更快
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# 模块级连接池：同一进程内的多次调用复用TCP连接
+_POOL = redis.ConnectionPool(host='localhost', port=6379, db=0, decode_responses=True, max_connections=4)
+
+# 任务队列
+TASK_QUEUES = ['download_queue', 'process_queue', 'upload_queue', 'failed_tasks']
+
+# SCAN 每批返回的建议数量 / 每次 UNLINK 的键数量
+SCAN_COUNT = 1000
+UNLINK_BATCH_SIZE = 500
+
+
+def _unlink_matching(r, pattern):
+    """使用 SCAN 增量查找匹配的键，并分批 UNLINK（后台释放内存，不阻塞Redis）
+
+    Returns:
+        int: 删除的键数量
+    """
+    removed = 0
+    batch = []
+    pipe = r.pipeline(transaction=False)
+    for key in r.scan_iter(match=pattern, count=SCAN_COUNT):
+        batch.append(key)
+        if len(batch) >= UNLINK_BATCH_SIZE:
+            pipe.unlink(*batch)
+            removed += len(batch)
+            batch = []
+    if batch:
+        pipe.unlink(*batch)
+        removed += len(batch)
+    pipe.execute()
+    return removed
+
+
+def _client():
+    """获取使用共享连接池的Redis客户端"""
+    return redis.Redis(connection_pool=_POOL)
+
+
+def _queue_lengths(r):
+    """一次往返获取所有任务队列的长度"""
+    with r.pipeline(transaction=False) as pipe:
+        for queue_name in TASK_QUEUES:
+            pipe.llen(queue_name)
+        return dict(zip(TASK_QUEUES, pipe.execute()))
+
+
 def clear_redis_tasks():
     """清理Redis中的所有任务数据"""
     try:
         # 连接Redis
-        r = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
+        r = _client()
         
-        print("🔍 检查Redis连接...")
+        logger.info("🔍 检查Redis连接...")
         r.ping()
-        print("✅ Redis连接成功")
-        
-        # 清理各种队列
-        queues_to_clear = [
-            'download_queue',
-            'process_queue', 
-            'upload_queue',
-            'failed_tasks'
-        ]
+        logger.info("✅ Redis连接成功")
         
+        # 清理各种队列：先批量获取长度，再一次性删除非空队列
         total_cleared = 0
+        non_empty_queues = []
         
-        for queue_name in queues_to_clear:
-            queue_length = r.llen(queue_name)
+        for queue_name, queue_length in _queue_lengths(r).items():
             if queue_length > 0:
-                print(f"🧹 清理队列 {queue_name}: {queue_length} 个任务")
-                r.delete(queue_name)
+                logger.info(f"🧹 清理队列 {queue_name}: {queue_length} 个任务")
+                non_empty_queues.append(queue_name)
                 total_cleared += queue_length
             else:
-                print(f"✅ 队列 {queue_name} 已为空")
+                logger.info(f"✅ 队列 {queue_name} 已为空")
         
-        # 清理任务数据
-        print("🔍 查找任务数据...")
-        task_keys = r.keys('task:*')
-        if task_keys:
-            print(f"🧹 清理任务数据: {len(task_keys)} 个任务")
-            r.delete(*task_keys)
-            total_cleared += len(task_keys)
+        if non_empty_queues:
+            r.unlink(*non_empty_queues)
+        
+        # 清理任务数据（SCAN + UNLINK，避免 KEYS/DEL 阻塞Redis）
+        logger.info("🔍 查找任务数据...")
+        task_count = _unlink_matching(r, 'task:*')
+        if task_count:
+            logger.info(f"🧹 清理任务数据: {task_count} 个任务")
+            total_cleared += task_count
         else:
-            print("✅ 没有找到任务数据")
+            logger.info("✅ 没有找到任务数据")
         
         # 清理其他相关数据
-        other_keys = r.keys('queue_stats') + r.keys('task_stats:*')
-        if other_keys:
-            print(f"🧹 清理统计数据: {len(other_keys)} 个键")
-            r.delete(*other_keys)
+        other_count = r.unlink('queue_stats') + _unlink_matching(r, 'task_stats:*')
+        if other_count:
+            logger.info(f"🧹 清理统计数据: {other_count} 个键")
         
-        print(f"✅ 清理完成！总共清理了 {total_cleared} 个项目")
-        print("💡 现在可以重新启动系统，新任务将包含正确的metadata")
+        logger.info(f"✅ 清理完成！总共清理了 {total_cleared} 个项目")
+        logger.info("💡 现在可以重新启动系统，新任务将包含正确的metadata")
         
     except redis.ConnectionError:
-        print("❌ 无法连接到Redis，请确保Redis服务正在运行")
+        logger.error("❌ 无法连接到Redis，请确保Redis服务正在运行")
         return False
     except Exception as e:
-        print(f"❌ 清理过程中出错: {e}")
+        logger.error(f"❌ 清理过程中出错: {e}")
         return False
     
     return True
@@ -69,47 +119,49 @@ def clear_redis_tasks():
 def show_current_tasks():
     """显示当前Redis中的任务"""
     try:
-        r = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
+        r = _client()
         r.ping()
         
-        print("📊 当前Redis中的任务状态:")
+        # 汇总所有输出行，最后一次性写入日志
+        lines = ["📊 当前Redis中的任务状态:"]
         
-        queues = ['download_queue', 'process_queue', 'upload_queue', 'failed_tasks']
-        for queue_name in queues:
-            length = r.llen(queue_name)
-            print(f"   {queue_name}: {length} 个任务")
+        for queue_name, length in _queue_lengths(r).items():
+            lines.append(f"   {queue_name}: {length} 个任务")
         
         task_keys = r.keys('task:*')
-        print(f"   任务数据: {len(task_keys)} 个")
+        lines.append(f"   任务数据: {len(task_keys)} 个")
         
         # 显示一些任务的metadata示例
         if task_keys:
-            print("\n📝 任务metadata示例:")
-            for i, key in enumerate(task_keys[:3]):  # 只显示前3个
+            lines.append("\n📝 任务metadata示例:")
+            sample_data = r.mget(task_keys[:3])  # 只显示前3个，一次MGET取回
+            for i, task_data in enumerate(sample_data):
                 try:
-                    task_data = r.get(key)
                     if task_data:
-                        task_dict = json.loads(task_data)
+                        task_dict = _json_loads(task_data)
                         metadata = task_dict.get('metadata', {})
-                        print(f"   任务 {i+1}:")
-                        print(f"     ID: {task_dict.get('task_id', 'N/A')}")
-                        print(f"     post_id: {metadata.get('post_id', '❌ 缺失')}")
-                        print(f"     cover_title_up: {metadata.get('cover_title_up', '❌ 缺失')}")
-                        print(f"     cover_title_down: {metadata.get('cover_title_down', '❌ 缺失')}")
+                        lines.append(f"   任务 {i+1}:")
+                        lines.append(f"     ID: {task_dict.get('task_id', 'N/A')}")
+                        lines.append(f"     post_id: {metadata.get('post_id', '❌ 缺失')}")
+                        lines.append(f"     cover_title_up: {metadata.get('cover_title_up', '❌ 缺失')}")
+                        lines.append(f"     cover_title_down: {metadata.get('cover_title_down', '❌ 缺失')}")
                 except Exception as e:
-                    print(f"     ❌ 解析任务数据失败: {e}")
+                    lines.append(f"     ❌ 解析任务数据失败: {e}")
+        
+        logger.info("\n".join(lines))
         
     except Exception as e:
-        print(f"❌ 查看任务状态失败: {e}")
+        logger.error(f"❌ 查看任务状态失败: {e}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     if len(sys.argv) > 1 and sys.argv[1] == "--show":
         show_current_tasks()
     elif len(sys.argv) > 1 and sys.argv[1] == "--clear":
         if clear_redis_tasks():
-            print("\n🚀 建议现在重新启动集群工作器:")
-            print("python start_lightweight.py --cluster-worker --port 8005")
+            logger.info("\n🚀 建议现在重新启动集群工作器:")
+            logger.info("python start_lightweight.py --cluster-worker --port 8005")
     else:
-        print("用法:")
-        print("  python clear_redis_tasks.py --show   # 显示当前任务状态")
-        print("  python clear_redis_tasks.py --clear  # 清理所有任务")
+        logger.info("用法:")
+        logger.info("  python clear_redis_tasks.py --show   # 显示当前任务状态")
+        logger.info("  python clear_redis_tasks.py --clear  # 清理所有任务")